@@ -3,19 +3,18 @@ import pkgutil
 from configparser import ConfigParser
 import json
 
-import PyQt5.QtWidgets
-import PyQt5.QtGui
-import PyQt5.QtCore
-import PyQt5.QtNetwork
-
-import pyqtgraph as pg
-
 DEFAULTUSERCONFIGPATH = Path.home() / ".config/EasyG/easyg.ini"
 ANALYZECONFIGPATH = "gui/plotmanager/datawidget/analyzewidget/analyzewidget.ini"
 
 
+def _hostAddress(address):
+    from PyQt5.QtNetwork import QHostAddress
+
+    return QHostAddress(address)
+
+
 converters = {
-    "HostAddress": PyQt5.QtNetwork.QHostAddress,
+    "HostAddress": _hostAddress,
     "Geometry": lambda s: tuple(int(g) for g in s.split())
 }
 
@@ -62,8 +61,14 @@ def getAnalyzeWidgetConfig(configfile=ANALYZECONFIGPATH):
     return _ANALYZECONFIG
 
 
-def setPyqtgraphConfig(config=getConfig()):
-    for k, v in config["plotting"].items():
-        pg.setConfigOption(k, v)
+def setPyqtgraphConfig(config=None):
+    import pyqtgraph as pg
+
+    if config is None:
+        config = getConfig()
+
+    if config.has_section("plotting"):
+        for k, v in config["plotting"].items():
+            pg.setConfigOption(k, v)
 
     return config
@@ -0,0 +1,159 @@
+"""Compare the processor backends against hp.process on the examples that
+ship with heartpy. Run with
+
+    python -m EasyG.ecg.benchmark
+
+Detected peaks are matched to the peaks accepted by heartpy within a
+tolerance, heartpy itself is the reference and scores perfectly. All
+backends share the same (rather expensive) measure calculation, so the peak
+detection is timed on its own as well."""
+
+import sys
+import time
+
+import numpy as np
+import heartpy as hp
+from heartpy import datautils, peakdetection
+
+from . import ecgprocessors
+from .registry import getRegistry
+
+
+DEFAULTPROCESSORS = ("HeartPyProcess", "PanTompkinsProcess")
+DEFAULTTOLERANCE = 0.05
+DEFAULTREPEAT = 5
+
+
+def _heartPyPeaks(hrdata, sample_rate, windowsize=0.75):
+    # the peak detection part of hp.process
+    rolmean = datautils.rolling_mean(hrdata, windowsize, sample_rate)
+    working_data = peakdetection.fit_peaks(hrdata, rolmean, sample_rate)
+
+    return working_data["peaklist"]
+
+
+# {processorName: peak detection only}
+DETECTORS = {"HeartPyProcess": _heartPyPeaks,
+             "PanTompkinsProcess": ecgprocessors.PanTompkinsPeaks}
+
+
+def exampleRecordings():
+    """(name, hrdata, sample_rate) of the heartpy example recordings"""
+    data, _ = hp.load_exampledata(0)
+    # example 0 is documented to be recorded at 100Hz
+    yield "example 0", np.asarray(data, dtype=float), 100.0
+
+    data, timer = hp.load_exampledata(1)
+    yield ("example 1", np.asarray(data, dtype=float),
+           hp.get_samplerate_mstimer(timer))
+
+    data, timer = hp.load_exampledata(2)
+    yield ("example 2", np.asarray(data, dtype=float),
+           hp.get_samplerate_datetime(timer,
+                                      timeformat="%Y-%m-%d %H:%M:%S.%f"))
+
+
+def acceptedPeaks(working_data):
+    peaklist = np.asarray(working_data["peaklist"], dtype=int)
+    binary = np.asarray(working_data["binary_peaklist"], dtype=bool)
+
+    return peaklist[binary]
+
+
+def matchPeaks(reference, detected, tolerance):
+    """Greedy one to one matching of peak indices, returns the number of
+    true positives, false positives and false negatives"""
+    reference = np.sort(reference)
+    detected = np.sort(detected)
+
+    matched = 0
+    refIdx = detIdx = 0
+    while refIdx < len(reference) and detIdx < len(detected):
+        delta = detected[detIdx] - reference[refIdx]
+
+        if abs(delta) <= tolerance:
+            matched += 1
+            refIdx += 1
+            detIdx += 1
+
+        elif delta < 0:
+            detIdx += 1
+
+        else:
+            refIdx += 1
+
+    return matched, len(detected) - matched, len(reference) - matched
+
+
+def timeProcessor(processor, hrdata, sample_rate, repeat=DEFAULTREPEAT):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = processor(hrdata, sample_rate)
+        best = min(best, time.perf_counter() - start)
+
+    return result, best
+
+
+def benchmark(processors=DEFAULTPROCESSORS, tolerance=DEFAULTTOLERANCE,
+              repeat=DEFAULTREPEAT):
+    """Yields one result dict per recording and processor"""
+    for name, hrdata, sample_rate in exampleRecordings():
+        reference, _ = hp.process(hrdata, sample_rate)
+        reference = acceptedPeaks(reference)
+
+        for processorName in processors:
+            processor = getRegistry().load("processor", processorName)
+            result = {"recording": name,
+                      "processor": processorName,
+                      "samples": len(hrdata)}
+
+            try:
+                (working_data, measures), seconds = timeProcessor(
+                    processor, hrdata, sample_rate, repeat)
+
+            except Exception as err:
+                result["error"] = str(err)
+
+            else:
+                tp, fp, fn = matchPeaks(reference,
+                                        acceptedPeaks(working_data),
+                                        int(tolerance * sample_rate))
+
+                result.update(seconds=seconds,
+                              bpm=measures["bpm"],
+                              sensitivity=tp / max(tp + fn, 1),
+                              precision=tp / max(tp + fp, 1))
+
+                if processorName in DETECTORS:
+                    _, result["detectionSeconds"] = timeProcessor(
+                        DETECTORS[processorName], hrdata, sample_rate,
+                        repeat)
+
+            yield result
+
+
+def main(processors=DEFAULTPROCESSORS):
+    print(f"{'recording':<12}{'processor':<24}{'samples':>9}{'total/ms':>10}"
+          f"{'detect/ms':>11}{'bpm':>8}{'sens.':>8}{'prec.':>8}")
+
+    for result in benchmark(processors):
+        line = (f"{result['recording']:<12}{result['processor']:<24}"
+                f"{result['samples']:>9}")
+
+        if "error" in result:
+            line += f"  failed: {result['error']}"
+
+        else:
+            detection = result.get("detectionSeconds", np.nan)
+            line += (f"{1000 * result['seconds']:>10.1f}"
+                     f"{1000 * detection:>11.1f}"
+                     f"{result['bpm']:>8.1f}"
+                     f"{result['sensitivity']:>8.3f}"
+                     f"{result['precision']:>8.3f}")
+
+        print(line)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or DEFAULTPROCESSORS)
@@ -0,0 +1,82 @@
+from itertools import count
+
+import numpy as np
+
+from .timeseries import TimeSeries, TimeSeriesBuffer
+
+
+class DataStore(object):
+    """The signal data of all sources, independent of their plots. Every
+    source is stored once as contiguous float arrays, plot items only hold
+    references to them. The version of a source changes with its data."""
+
+    # globally unique versions, so result cache keys never collide
+    _versions = count()
+
+    def __init__(self):
+        # {name: TimeSeries}
+        self._series = {}
+        # {name: version}
+        self._version = {}
+        # {name: TimeSeriesBuffer} of the sources data was appended to
+        self._buffers = {}
+
+    def __contains__(self, name):
+        return name in self._series
+
+    def names(self):
+        return list(self._series)
+
+    def set(self, name, x, y):
+        """Store (or replace) the data of name, returns its TimeSeries.
+        Contiguous float arrays, like the views of a stream buffer, are
+        stored without copying."""
+        series = TimeSeries(np.ascontiguousarray(x, dtype=float),
+                            np.ascontiguousarray(y, dtype=float))
+
+        self._buffers.pop(name, None)
+
+        return self._store(name, series)
+
+    def append(self, name, x, y, maxLength=None):
+        """Append samples to the data of name (created if missing), returns
+        the new TimeSeries. The data is kept in a buffer with spare
+        capacity, so appending does not copy the stored samples. Only the
+        new samples are checked to be sorted. maxLength limits the buffer
+        created for name, see TimeSeriesBuffer."""
+        buffer = self._buffers.get(name)
+
+        if buffer is None:
+            data = self.data(name) if name in self else ()
+            buffer = TimeSeriesBuffer(*data, maxLength=maxLength)
+            self._buffers[name] = buffer
+
+        buffer.append(x, y)
+
+        return self._store(name, buffer.series())
+
+    def _store(self, name, series):
+        self._series[name] = series
+        self._version[name] = next(DataStore._versions)
+
+        return series
+
+    def remove(self, name):
+        del self._series[name]
+        del self._version[name]
+        self._buffers.pop(name, None)
+
+    def series(self, name):
+        try:
+            return self._series[name]
+
+        except KeyError:
+            raise KeyError(f"No data for {name} stored!")
+
+    def data(self, name):
+        series = self.series(name)
+
+        return series.x, series.y
+
+    def version(self, name):
+        return self._version[name]
@@ -1,5 +1,328 @@
-import heartpy as hp
+from configparser import ConfigParser
+from functools import lru_cache
+import json
 
+import numpy as np
+
+from EasyG.config import writeConfigToFile, DEFAULTUSERCONFIGPATH
+from .registry import getRegistry
+
+
+DEFAULTCHUNKSIZE = 2 ** 18
+DEFAULTNOTCHQ = 30.0
+
+_PRESETSECTION = "filter.presets"
+
+# impulse responses are considered settled below this fraction of their peak
+_SETTLETOLERANCE = 1e-10
+_MAXSETTLELENGTH = 2 ** 22
+
+
+# heartpy and scipy.signal are imported on first use, they are slow to
+# import and not needed for building pipelines
+
+
+def HeartPyFilter(*args, cancelToken=None, **kwargs):
+    import heartpy as hp
 
-def HeartPyFilter(*args, **kwargs):
     return hp.filter_signal(*args, **kwargs)
+
+
+def _normalizeCutoff(cutoff):
+    if np.ndim(cutoff):
+        cutoff = tuple(float(c) for c in cutoff)
+
+    else:
+        cutoff = float(cutoff)
+
+    return cutoff
+
+
+@lru_cache(maxsize=128)
+def _designFilter(filtertype, cutoff, sample_rate, order, notchQ):
+    from scipy import signal
+
+    nyquist = 0.5 * sample_rate
+
+    if filtertype in ("lowpass", "highpass"):
+        sos = signal.butter(order, cutoff / nyquist, btype=filtertype,
+                            output="sos")
+
+    elif filtertype == "bandpass":
+        lower, upper = cutoff
+        sos = signal.butter(order, [lower / nyquist, upper / nyquist],
+                            btype="bandpass", output="sos")
+
+    elif filtertype == "notch":
+        b, a = signal.iirnotch(cutoff, Q=notchQ, fs=sample_rate)
+        sos = signal.tf2sos(b, a)
+
+    else:
+        raise ValueError(f"filtertype: {filtertype} is unknown, available "
+                         "are: lowpass, highpass, bandpass and notch")
+
+    return sos, _settleLength(sos)
+
+
+def _settleLength(sos):
+    # number of samples until the impulse response has decayed, this is how
+    # far chunk seams have to be padded to be indistinguishable
+    from scipy import signal
+
+    length = 1024
+
+    while True:
+        impulse = np.zeros(length)
+        impulse[0] = 1
+        response = np.abs(signal.sosfilt(sos, impulse))
+
+        above = np.flatnonzero(response > _SETTLETOLERANCE * response.max())
+        settle = above[-1] + 1 if len(above) else 1
+
+        if settle < length // 2 or length >= _MAXSETTLELENGTH:
+            break
+
+        length *= 4
+
+    return int(settle)
+
+
+def designFilter(filtertype, cutoff, sample_rate, order=2,
+                 notchQ=DEFAULTNOTCHQ):
+    """Butterworth (or notch) design as second order sections. Designs are
+    cached and shared, the returned array must not be modified."""
+
+    sos, _ = _designFilter(filtertype, _normalizeCutoff(cutoff),
+                           float(sample_rate), int(order), float(notchQ))
+
+    return sos
+
+
+def _sosfiltfiltChunked(sos, data, settle, chunkSize, cancelToken=None):
+    # every chunk is filtered together with enough neighbouring samples to
+    # let the filter settle, only the core of the chunk is kept
+    from scipy import signal
+
+    pad = 2 * settle
+
+    if len(data) <= chunkSize + 2 * pad:
+        return signal.sosfiltfilt(sos, data)
+
+    filtered = np.empty(len(data))
+
+    for start in range(0, len(data), chunkSize):
+        if cancelToken is not None:
+            cancelToken.raiseIfCancelled()
+
+        stop = min(start + chunkSize, len(data))
+        padStart = max(start - pad, 0)
+        padStop = min(stop + pad, len(data))
+
+        chunk = signal.sosfiltfilt(sos, data[padStart:padStop])
+        filtered[start:stop] = chunk[start - padStart:stop - padStart]
+
+    return filtered
+
+
+def SOSFilter(data, cutoff, sample_rate, order=2, filtertype="lowpass",
+              return_top=False, notchQ=DEFAULTNOTCHQ,
+              chunkSize=DEFAULTCHUNKSIZE, cancelToken=None):
+    """Zero phase filtering with cached second order section designs.
+    Takes the same arguments as HeartPyFilter but stays numerically stable
+    at high filter orders and filters long signals chunk by chunk."""
+
+    pipeline = FilterPipeline([{"filtertype": filtertype,
+                                "cutoff": cutoff,
+                                "sample_rate": sample_rate,
+                                "order": order,
+                                "notchQ": notchQ}])
+
+    return pipeline.apply(data, return_top=return_top, chunkSize=chunkSize,
+                          cancelToken=cancelToken)
+
+
+def _stageKey(stage):
+    return (stage["filtertype"], _normalizeCutoff(stage["cutoff"]),
+            float(stage["sample_rate"]), int(stage.get("order", 2)),
+            float(stage.get("notchQ", DEFAULTNOTCHQ)))
+
+
+@lru_cache(maxsize=128)
+def _designPipeline(stageKeys):
+    # cascading the sections of all stages is the same as running the
+    # stages one after another, but needs only one pass over the data
+    registry = getRegistry()
+    sos = np.vstack([registry.load("filter", key[0])(*key)
+                     for key in stageKeys])
+
+    return sos, _settleLength(sos)
+
+
+class FilterPipeline(object):
+    """Ordered list of filter stages, each given by the options of the
+    filter widget, which is executed as a single cascade of second order
+    sections. Only the final output is materialized."""
+
+    def __init__(self, stages=(), name=None):
+        self.name = name
+        self.stages = [dict(stage) for stage in stages]
+
+    def __len__(self):
+        return len(self.stages)
+
+    def __iter__(self):
+        return iter(self.stages)
+
+    def addStage(self, stage):
+        self.stages.append(dict(stage))
+
+    def removeStage(self, idx):
+        del self.stages[idx]
+
+    def clear(self):
+        self.stages.clear()
+
+    def _design(self):
+        if not self.stages:
+            raise ValueError("Pipeline has no stages!")
+
+        return _designPipeline(tuple(_stageKey(s) for s in self.stages))
+
+    def sos(self):
+        return self._design()[0]
+
+    def description(self):
+        return " -> ".join(s["filtertype"] for s in self.stages)
+
+    def apply(self, data, return_top=False, chunkSize=DEFAULTCHUNKSIZE,
+              cancelToken=None):
+        sos, settle = self._design()
+
+        data = np.asarray(data, dtype=float)
+        chunkSize = max(chunkSize, 4 * settle)
+
+        filtered = _sosfiltfiltChunked(sos, data, settle, chunkSize,
+                                       cancelToken)
+
+        if return_top:
+            filtered = np.clip(filtered, a_min=0, a_max=None)
+
+        return filtered
+
+    def streamingFilter(self):
+        return StreamingFilter(self.sos())
+
+    def withSampleRate(self, sample_rate):
+        """Copy in which the stages without a sample rate filter at
+        sample_rate"""
+        stages = [dict(stage) for stage in self.stages]
+
+        for stage in stages:
+            stage.setdefault("sample_rate", sample_rate)
+
+        return FilterPipeline(stages, name=self.name)
+
+    def withoutSampleRate(self):
+        """Copy without the sample rates of the stages, e.g. for presets
+        applied to data of any sample rate"""
+        stages = [dict(stage) for stage in self.stages]
+
+        for stage in stages:
+            stage.pop("sample_rate", None)
+
+        return FilterPipeline(stages, name=self.name)
+
+    def toJSON(self):
+        return json.dumps(self.stages)
+
+    @classmethod
+    def fromJSON(cls, data, name=None):
+        return cls(json.loads(data), name=name)
+
+
+def _getPresetConfig(configfile):
+    # preset names are case sensitive, the default ConfigParser lowercases
+    # option names
+    config = ConfigParser(interpolation=None)
+    config.optionxform = str
+    config.read(configfile)
+
+    return config
+
+
+def _checkPresetName(name):
+    # the name is the option name in the ini file
+    if (not name or name != name.strip() or name[0] in "#;["
+            or any(char in name for char in ":=")):
+        raise ValueError(f"Invalid preset name: {name!r}. Names must not "
+                         "contain ':' or '=', start with '#', ';' or '[' or "
+                         "start or end with whitespace.")
+
+
+def loadPipelinePresets(configfile=DEFAULTUSERCONFIGPATH):
+    config = _getPresetConfig(configfile)
+
+    presets = {}
+    if config.has_section(_PRESETSECTION):
+        for name, data in config[_PRESETSECTION].items():
+            try:
+                pipeline = FilterPipeline.fromJSON(data, name=name)
+
+            except (ValueError, TypeError):
+                # broken entry, e.g. edited by hand
+                continue
+
+            presets[name] = pipeline.withoutSampleRate()
+
+    return presets
+
+
+def savePipelinePreset(name, pipeline, configfile=DEFAULTUSERCONFIGPATH):
+    """Presets are stored without the sample rates, they are filled in
+    from the data the preset is applied to"""
+    _checkPresetName(name)
+
+    config = _getPresetConfig(configfile)
+
+    if not config.has_section(_PRESETSECTION):
+        config.add_section(_PRESETSECTION)
+
+    config[_PRESETSECTION][name] = pipeline.withoutSampleRate().toJSON()
+    writeConfigToFile(configfile, config)
+
+    pipeline.name = name
+
+
+class StreamingFilter(object):
+    """Causal IIR filter which keeps its state between blocks, so a live
+    stream can be filtered block by block without touching its history."""
+
+    def __init__(self, sos):
+        self.sos = sos
+        self._zi = None
+
+    @classmethod
+    def fromOptions(cls, cutoff, sample_rate, order=2, filtertype="lowpass",
+                    notchQ=DEFAULTNOTCHQ, **kwargs):
+        return cls(designFilter(filtertype, cutoff, sample_rate, order=order,
+                                notchQ=notchQ))
+
+    def reset(self):
+        self._zi = None
+
+    def process(self, block):
+        from scipy import signal
+
+        block = np.asarray(block, dtype=float)
+
+        if not len(block):
+            return block
+
+        if self._zi is None:
+            # start in steady state for the first sample to avoid a
+            # large step response
+            self._zi = signal.sosfilt_zi(self.sos) * block[0]
+
+        filtered, self._zi = signal.sosfilt(self.sos, block, zi=self._zi)
+
+        return filtered
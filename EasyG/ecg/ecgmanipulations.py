@@ -0,0 +1,128 @@
+from fractions import Fraction
+
+import numpy as np
+
+
+DEFAULTCHUNKSIZE = 2 ** 18
+# largest denominator of the resampling ratio, keeps the polyphase filters
+# short for arbitrary target lengths
+DEFAULTMAXDENOMINATOR = 1000
+
+# timestamps deviating more than this fraction of the mean sampling interval
+# are considered non-uniform
+_UNIFORMTOLERANCE = 1e-3
+
+
+def resamplingRatio(length, num, factor=True,
+                    maxDenominator=DEFAULTMAXDENOMINATOR):
+    """(up, down) of resampling length samples by the factor num, or to num
+    samples if factor is False"""
+    if factor:
+        ratio = Fraction(num).limit_denominator(maxDenominator)
+
+    else:
+        ratio = Fraction(int(num), length).limit_denominator(maxDenominator)
+
+    if ratio <= 0:
+        raise ValueError("Number of new sample points must be positive!")
+
+    return ratio.numerator, ratio.denominator
+
+
+def isUniform(x):
+    step = np.diff(x)
+
+    if not len(step):
+        return True
+
+    mean = step.mean()
+    return np.all(np.abs(step - mean) <= _UNIFORMTOLERANCE * abs(mean))
+
+
+class _UniformSignal(object):
+    # uniformly sampled view of (x, y), non-uniform data is interpolated
+    # linearly, but only for the samples actually requested
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.start = x[0]
+
+        # the grid spans x with as many samples, rounding the span by the
+        # mean step could lose the last one
+        self.dt = (x[-1] - x[0]) / max(len(x) - 1, 1)
+        self.length = len(y)
+        self._interpolate = not isUniform(x)
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, bounds):
+        if not self._interpolate:
+            return self.y[bounds]
+
+        t = self.start + self.dt * np.arange(*bounds.indices(self.length))
+
+        return np.interp(t, self.x, self.y)
+
+
+def _resamplePolyChunked(data, up, down, chunkSize, cancelToken=None):
+    from scipy import signal
+
+    length = len(data)
+    outLength = -(-length * up // down)
+
+    # same anti-aliasing filter as resample_poly, seams are padded by its
+    # half length. Chunks and padding are multiples of down, so every chunk
+    # starts exactly on an output sample
+    halfLength = 10 * max(up, down)
+    pad = -(-(halfLength // up + 1) // down) * down
+    chunkSize = max(chunkSize // down, 1) * down
+
+    if length <= chunkSize + 2 * pad:
+        return signal.resample_poly(data[0:length], up, down)
+
+    resampled = np.empty(outLength)
+
+    for start in range(0, length, chunkSize):
+        if cancelToken is not None:
+            cancelToken.raiseIfCancelled()
+
+        stop = min(start + chunkSize, length)
+        padStart = max(start - pad, 0)
+        padStop = min(stop + pad, length)
+
+        chunk = signal.resample_poly(data[padStart:padStop], up, down)
+
+        outStart = start * up // down
+        outStop = stop * up // down if stop < length else outLength
+        offset = (start - padStart) * up // down
+
+        resampled[outStart:outStop] = chunk[offset:offset + outStop - outStart]
+
+    return resampled
+
+
+def Resample(x, y, num, factor=True, chunkSize=DEFAULTCHUNKSIZE,
+             maxDenominator=DEFAULTMAXDENOMINATOR, cancelToken=None):
+    """Rational polyphase resampling with anti-aliasing of y by the factor
+    num, or to num samples if factor is False. Non-uniform timestamps are
+    linearly interpolated onto a uniform grid first. Long signals are
+    resampled chunk by chunk. Returns the new x and y."""
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    if len(x) != len(y):
+        raise ValueError("x and y need to have the same length!")
+
+    if len(y) < 2:
+        raise ValueError("Need at least two samples to resample!")
+
+    uniform = _UniformSignal(x, y)
+    up, down = resamplingRatio(len(uniform), num, factor=factor,
+                               maxDenominator=maxDenominator)
+
+    newY = _resamplePolyChunked(uniform, up, down, chunkSize, cancelToken)
+    newX = uniform.start + np.arange(len(newY)) * (uniform.dt * down / up)
+
+    return newX, newY
@@ -1,5 +1,540 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import multiprocessing
+import os
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import heartpy as hp
+from heartpy import analysis, peakdetection
+from heartpy.exceptions import BadSignalWarning
+from scipy import signal
+
+from .ecgfilters import designFilter
 
 
-def HeartPyProcess(*args, **kwargs):
+def HeartPyProcess(*args, cancelToken=None, **kwargs):
+    # hp.process can not be interrupted, the token is accepted so all
+    # processors share the same interface
     return hp.process(*args, **kwargs)
+
+
+_EXECUTOR = None
+_EXECUTORWORKERS = None
+
+
+def _getProcessPool(maxWorkers=None):
+    global _EXECUTOR, _EXECUTORWORKERS
+
+    maxWorkers = maxWorkers or os.cpu_count() or 1
+
+    if _EXECUTOR is None or _EXECUTORWORKERS != maxWorkers:
+        if _EXECUTOR is not None:
+            _EXECUTOR.shutdown(wait=False, cancel_futures=True)
+
+        # never fork the running Qt application, spawn fresh interpreters
+        _EXECUTOR = ProcessPoolExecutor(
+            max_workers=maxWorkers,
+            mp_context=multiprocessing.get_context("spawn"))
+        _EXECUTORWORKERS = maxWorkers
+
+    return _EXECUTOR
+
+
+def _segmentPeaks(segment, sample_rate, kwargs):
+    # runs inside the process pool, only ship the peaks back
+    try:
+        working_data, _ = hp.process(segment, sample_rate, **kwargs)
+
+    except BadSignalWarning:
+        # e.g. a flat segment without any detectable beats
+        peaks = np.array([], dtype=int)
+
+    else:
+        peaks = np.asarray(working_data["peaklist"], dtype=int)
+
+    return peaks
+
+
+def _segmentBounds(length, segmentLength, segmentOverlap):
+    step = segmentLength - segmentOverlap
+
+    bounds = []
+    start = 0
+    while start < length:
+        stop = min(start + segmentLength, length)
+        bounds.append((start, stop))
+
+        if stop == length:
+            break
+
+        start += step
+
+    return bounds
+
+
+def _stitchPeaks(hrdata, segmentPeaks, bounds, segmentOverlap, minDistance):
+    """Every segment owns the samples from the middle of its leading
+    overlap to the middle of its trailing overlap. Only owned peaks are
+    kept. A beat at a seam may be found by both segments a few samples
+    apart, such doublets across the seams are resolved by amplitude. All
+    other peaks are kept as heartpy returned them."""
+
+    halfOverlap = segmentOverlap // 2
+    stitched = []
+    seams = []
+
+    for idx, ((start, stop), peaks) in enumerate(zip(bounds, segmentPeaks)):
+        ownedStart = start + halfOverlap if idx > 0 else start
+        ownedStop = (bounds[idx + 1][0] + halfOverlap
+                     if idx + 1 < len(bounds) else stop)
+
+        peaks = peaks + start
+        stitched.append(peaks[(ownedStart <= peaks) & (peaks < ownedStop)])
+
+        if idx + 1 < len(bounds):
+            seams.append(ownedStop)
+
+    if not stitched:
+        return np.array([], dtype=int)
+
+    peaks = np.concatenate(stitched).astype(int)
+    keep = np.ones(len(peaks), dtype=bool)
+
+    for after in np.searchsorted(peaks, seams):
+        before = after - 1
+
+        if (before < 0 or after == len(peaks)
+                or peaks[after] - peaks[before] >= minDistance):
+            continue
+
+        if hrdata[peaks[after]] > hrdata[peaks[before]]:
+            keep[before] = False
+
+        else:
+            keep[after] = False
+
+    return peaks[keep]
+
+
+def HeartPyParallelProcess(hrdata, sample_rate, segmentLength=300,
+                           segmentOverlap=10, maxWorkers=None,
+                           cancelToken=None, **kwargs):
+    """Run heartpy on overlapping segments of hrdata in a process pool,
+    stitch the segment peaklists and derive the measures from the
+    stitched peaks just like hp.process does.
+
+    segmentLength and segmentOverlap are given in seconds."""
+
+    hrdata = np.asarray(hrdata, dtype=float)
+
+    segmentLength = int(segmentLength * sample_rate)
+    segmentOverlap = int(segmentOverlap * sample_rate)
+
+    if segmentOverlap >= segmentLength:
+        raise ValueError("Segment overlap must be smaller than the segment "
+                         "length!")
+
+    if len(hrdata) <= segmentLength + segmentOverlap:
+        # not worth the overhead
+        return hp.process(hrdata, sample_rate, **kwargs)
+
+    bounds = _segmentBounds(len(hrdata), segmentLength, segmentOverlap)
+
+    # the frequency domain is only meaningful on the stitched result
+    segmentKwargs = dict(kwargs, calc_freq=False)
+
+    pool = _getProcessPool(maxWorkers)
+    futures = [pool.submit(_segmentPeaks, hrdata[start:stop], sample_rate,
+                           segmentKwargs)
+               for start, stop in bounds]
+
+    pending = set(futures)
+    while pending:
+        _, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+
+        if cancelToken is not None and cancelToken.isCancelled():
+            for future in pending:
+                future.cancel()
+
+            cancelToken.raiseIfCancelled()
+
+    segmentPeaks = [future.result() for future in futures]
+
+    bpmmax = kwargs.get("bpmmax", 180)
+    minDistance = int(60 / bpmmax * sample_rate)
+    peaklist = _stitchPeaks(hrdata, segmentPeaks, bounds, segmentOverlap,
+                            minDistance)
+
+    if len(peaklist) < 2:
+        raise BadSignalWarning("Could not detect enough peaks to process "
+                               "the signal.")
+
+    return _measuresFromPeaks(hrdata, sample_rate, peaklist, **kwargs)
+
+
+def _measuresFromPeaks(hrdata, sample_rate, peaklist, calc_freq=False,
+                       freq_method="welch", welch_wsize=240,
+                       freq_square=False, reject_segmentwise=False,
+                       breathing_method="welch", clean_rr=False,
+                       clean_rr_method="quotient-filter", **kwargs):
+    # mirrors the analysis part of hp.process
+    working_data = {"hr": hrdata,
+                    "sample_rate": sample_rate,
+                    "peaklist": peaklist,
+                    "ybeat": hrdata[peaklist]}
+    measures = {}
+
+    working_data = analysis.calc_rr(working_data["peaklist"], sample_rate,
+                                    working_data=working_data)
+    working_data = peakdetection.check_peaks(
+        working_data["RR_list"], working_data["peaklist"],
+        working_data["ybeat"], reject_segmentwise,
+        working_data=working_data)
+
+    if clean_rr:
+        working_data = analysis.clean_rr_intervals(
+            working_data, method=clean_rr_method)
+
+    working_data, measures = analysis.calc_ts_measures(
+        working_data["RR_list_cor"], working_data["RR_diff"],
+        working_data["RR_sqdiff"], measures=measures,
+        working_data=working_data)
+
+    measures = analysis.calc_poincare(
+        working_data["RR_list"], working_data["RR_masklist"],
+        measures=measures, working_data=working_data)
+
+    try:
+        measures, working_data = analysis.calc_breathing(
+            working_data["RR_list_cor"], method=breathing_method,
+            measures=measures, working_data=working_data)
+
+    except Exception:
+        measures["breathingrate"] = np.nan
+
+    if calc_freq:
+        working_data, measures = analysis.calc_fd_measures(
+            method=freq_method, welch_wsize=welch_wsize,
+            square_spectrum=freq_square, measures=measures,
+            working_data=working_data)
+
+    return working_data, measures
+
+
+def PanTompkinsProcess(hrdata, sample_rate, windowsize=0.15,
+                       passband=(5, 15), refractory=0.2, cancelToken=None,
+                       **kwargs):
+    """Pan-Tompkins style QRS detection as a fast alternative to
+    hp.process, returns working_data and measures just like it.
+
+    windowsize is the integration window and refractory the minimum
+    distance between two beats, both in seconds."""
+
+    hrdata = np.asarray(hrdata, dtype=float)
+    peaklist = PanTompkinsPeaks(hrdata, sample_rate, windowsize=windowsize,
+                                passband=passband, refractory=refractory,
+                                cancelToken=cancelToken)
+
+    if len(peaklist) < 2:
+        raise BadSignalWarning("Could not detect enough peaks to process "
+                               "the signal.")
+
+    return _measuresFromPeaks(hrdata, sample_rate, peaklist, **kwargs)
+
+
+def PanTompkinsPeaks(hrdata, sample_rate, windowsize=0.15, passband=(5, 15),
+                     refractory=0.2, cancelToken=None):
+    """Indices of the R peaks in hrdata. Band pass, derivative, squaring and
+    moving window integration are vectorized, only the adaptive thresholds
+    walk through the candidate peaks."""
+
+    hrdata = np.asarray(hrdata, dtype=float)
+
+    if len(hrdata) < 2 * sample_rate:
+        raise BadSignalWarning("Signal is too short for QRS detection.")
+
+    lower, upper = passband
+    upper = min(upper, 0.45 * sample_rate)
+    sos = designFilter("bandpass", (lower, upper), sample_rate)
+
+    # zero phase filtering and centered windows keep the integrated signal
+    # aligned with hrdata, no delay compensation is needed
+    filtered = signal.sosfiltfilt(sos, hrdata)
+    derivative = np.gradient(filtered)
+
+    window = max(int(windowsize * sample_rate), 1)
+    integrated = _movingAverage(derivative ** 2, window)
+
+    if cancelToken is not None:
+        cancelToken.raiseIfCancelled()
+
+    distance = max(int(refractory * sample_rate), 1)
+    candidates, _ = signal.find_peaks(integrated, distance=distance)
+
+    slopes = _windowMax(np.abs(derivative), candidates, window)
+    qrs = _adaptiveThresholds(integrated, candidates, slopes, sample_rate)
+
+    # the R peak is the maximum of the raw signal around the QRS complex
+    return np.unique(_windowArgmax(hrdata, qrs, window))
+
+
+def _movingAverage(data, window):
+    cumsum = np.cumsum(np.insert(data, 0, 0))
+    padded = np.concatenate((np.full(window // 2, cumsum[0]), cumsum,
+                             np.full(window - window // 2, cumsum[-1])))
+
+    return (padded[window:window + len(data)] - padded[:len(data)]) / window
+
+
+def _centeredWindows(data, idx, window):
+    # (len(idx), 2 * window + 1) view of data around every index
+    padded = np.pad(data, window, mode="edge")
+
+    return sliding_window_view(padded, 2 * window + 1)[idx]
+
+
+def _windowMax(data, idx, window):
+    return _centeredWindows(data, idx, window).max(axis=1)
+
+
+def _windowArgmax(data, idx, window):
+    return np.asarray(idx, dtype=int) + (
+        _centeredWindows(data, idx, window).argmax(axis=1) - window)
+
+
+def _adaptiveThresholds(integrated, candidates, slopes, sample_rate):
+    # running signal (spki) and noise (npki) levels, learned on the first
+    # two seconds
+    learning = integrated[:int(2 * sample_rate)]
+    spki = learning.max() / 3
+    npki = learning.mean() / 2
+
+    heights = integrated[candidates]
+    twaveDistance = 0.36 * sample_rate
+
+    qrs = []
+    rr = deque(maxlen=8)
+
+    for idx, (candidate, height) in enumerate(zip(candidates, heights)):
+        threshold = npki + 0.25 * (spki - npki)
+
+        while qrs and rr and (candidate - candidates[qrs[-1]]
+                              > 1.66 * sum(rr) / len(rr)):
+            # beats were missed, search back with half the threshold
+            between = np.arange(qrs[-1] + 1, idx)
+            between = between[heights[between] > 0.5 * threshold]
+
+            if not len(between):
+                break
+
+            missed = between[np.argmax(heights[between])]
+            spki += 0.25 * (heights[missed] - spki)
+            threshold = npki + 0.25 * (spki - npki)
+            rr.append(candidates[missed] - candidates[qrs[-1]])
+            qrs.append(missed)
+
+        if height <= threshold:
+            npki += 0.125 * (height - npki)
+            continue
+
+        if qrs and candidate - candidates[qrs[-1]] < twaveDistance:
+            if slopes[idx] < 0.5 * slopes[qrs[-1]]:
+                # shallow slope shortly after a beat, most likely a t-wave
+                npki += 0.125 * (height - npki)
+                continue
+
+        spki += 0.125 * (height - spki)
+
+        if qrs:
+            rr.append(candidate - candidates[qrs[-1]])
+
+        qrs.append(idx)
+
+    return candidates[qrs] if qrs else np.array([], dtype=int)
+
+
+# the running beat height starts at this percentile of the region heights
+BEATHEIGHTPERCENTILE = 75
+# number of recent regions the beat height is estimated from
+REGIONHISTORY = 16
+
+
+class StreamingBeatDetector(object):
+    """Incremental heartpy style beat detection for live streams. Every
+    block is searched together with a short lookback, so the work per block
+    does not depend on the length of the recording.
+
+    Peaks are the maxima of the regions where the signal rises above its
+    moving average. Regions whose height stays below heightThreshold times
+    the running height of recent beats (t-waves, dicrotic notches) are
+    ignored. The running height starts at a high percentile of the region
+    heights, so a single artifact does not set it. If no beat was accepted
+    for restartAfter seconds, e.g. an artifact raised the height or the
+    amplitude dropped, it is estimated again from the recent regions and
+    the rhythm starts over. A peak is accepted if its RR interval fits the
+    recent rhythm, using the same thresholds as heartpy's check_peaks."""
+
+    def __init__(self, sample_rate, windowsize=0.75, bpmmax=180,
+                 lookback=3.0, rrHistory=30, heightThreshold=0.4,
+                 restartAfter=3.0, **kwargs):
+        self.sample_rate = sample_rate
+        self.heightThreshold = heightThreshold
+
+        self._window = max(int(windowsize * sample_rate), 1)
+        self._lookback = max(int(lookback * sample_rate), 2 * self._window)
+        # assuming millisecond timestamps
+        self._minRR = 60000 / bpmmax
+        self._restartAfter = restartAfter * 1000
+
+        self._x = np.empty(0)
+        self._y = np.empty(0)
+
+        # timestamp until which regions have been evaluated
+        self._processedUntil = -np.inf
+        self._lastPeakX = None
+        self._rr = deque(maxlen=rrHistory)
+        # running height of beats above the moving average and the heights
+        # of the recent regions
+        self._beatHeight = None
+        self._regionHeights = deque(maxlen=REGIONHISTORY)
+
+        self.measures = {}
+
+    def process(self, x, y):
+        x = np.concatenate((self._x, np.asarray(x, dtype=float)))
+        y = np.concatenate((self._y, np.asarray(y, dtype=float)))
+
+        accepted, rejected = [], []
+
+        minLength = self._window + 1
+        if self._beatHeight is None:
+            # the first evaluation needs enough data to learn beat heights
+            minLength = self._lookback
+
+        if len(y) < minLength:
+            self._x, self._y = x, y
+            return self._asArrays(accepted), self._asArrays(rejected)
+
+        # centered moving average, only where the full window is available
+        half = self._window // 2
+        cumsum = np.cumsum(np.insert(y, 0, 0))
+        rolmean = (cumsum[self._window:] - cumsum[:-self._window])
+        rolmean /= self._window
+        validX = x[half:half + len(rolmean)]
+        validY = y[half:half + len(rolmean)]
+
+        height = validY - rolmean
+
+        above = (height > 0).astype(np.int8)
+        edges = np.diff(above)
+        starts = list(np.flatnonzero(edges == 1) + 1)
+        ends = list(np.flatnonzero(edges == -1) + 1)
+
+        if above[0]:
+            starts.insert(0, 0)
+
+        if self._beatHeight is None:
+            # the loop below adds these regions to the history
+            regionHeights = [height[start + np.argmax(validY[start:stop])]
+                             for start, stop in zip(starts, ends)]
+            self._beatHeight = np.percentile(regionHeights or height,
+                                             BEATHEIGHTPERCENTILE)
+
+        openStart = None
+        for idx, start in enumerate(starts):
+            if idx >= len(ends):
+                # region continues into the next block
+                openStart = start
+                break
+
+            stop = ends[idx]
+            if validX[start] <= self._processedUntil:
+                # evaluated in a previous block
+                continue
+
+            self._processedUntil = validX[stop]
+            peak = start + np.argmax(validY[start:stop])
+            self._regionHeights.append(height[peak])
+
+            if height[peak] < self.heightThreshold * self._beatHeight:
+                self._restartIfLost(validX[peak])
+                continue
+
+            if self._classifyPeak(validX[peak], validY[peak],
+                                  accepted, rejected):
+                self._beatHeight += 0.125 * (height[peak] - self._beatHeight)
+
+        # keep what is needed to finish open regions and the moving average
+        keepFrom = len(y) - self._window
+        if openStart is not None:
+            keepFrom = min(keepFrom, openStart)
+
+        keepFrom = max(keepFrom, len(y) - self._lookback, 0)
+        self._x, self._y = x[keepFrom:], y[keepFrom:]
+
+        return self._asArrays(accepted), self._asArrays(rejected)
+
+    def _restartIfLost(self, peakX):
+        if (self._lastPeakX is not None
+                and peakX - self._lastPeakX <= self._restartAfter):
+            return
+
+        self._beatHeight = np.percentile(self._regionHeights,
+                                         BEATHEIGHTPERCENTILE)
+
+        # the interval to the last beat is no RR interval
+        self._lastPeakX = None
+        self._rr.clear()
+
+    def _classifyPeak(self, peakX, peakY, accepted, rejected):
+        isAccepted = True
+        rr = None if self._lastPeakX is None else peakX - self._lastPeakX
+
+        if rr is not None and rr < self._minRR:
+            isAccepted = False
+
+        elif rr is not None and len(self._rr) >= 3:
+            meanRR = np.mean(self._rr)
+            threshold = max(0.3 * meanRR, 300)
+
+            if rr < meanRR - threshold:
+                # too early, most likely noise
+                isAccepted = False
+
+            elif rr > meanRR + threshold:
+                # missed beats in between, no valid RR interval
+                rr = None
+
+        if isAccepted:
+            accepted.append((peakX, peakY))
+            self._lastPeakX = peakX
+
+            if rr is not None:
+                self._rr.append(rr)
+                self._updateMeasures()
+
+        else:
+            rejected.append((peakX, peakY))
+
+        return isAccepted
+
+    def _updateMeasures(self):
+        rr = np.asarray(self._rr)
+
+        self.measures = {"bpm": 60000 / np.mean(rr),
+                         "ibi": np.mean(rr),
+                         "sdnn": np.std(rr)}
+
+        if len(rr) > 1:
+            self.measures["rmssd"] = np.sqrt(np.mean(np.diff(rr) ** 2))
+
+    @staticmethod
+    def _asArrays(peaks):
+        if peaks:
+            x, y = np.asarray(peaks).T
+
+        else:
+            x, y = np.empty(0), np.empty(0)
+
+        return x, y
@@ -0,0 +1,190 @@
+import numpy as np
+
+from PyQt5 import QtCore
+
+
+DEFAULTCAPACITY = 2 ** 20
+DEFAULTFLUSHINTERVAL = 40
+DEFAULTPEAKCAPACITY = 2 ** 14
+
+
+class RingBuffer(object):
+    """Fixed capacity buffer of (x, y) samples. Every sample is written
+    twice, capacity apart, so the buffered data is always available as a
+    contiguous view without copying."""
+
+    def __init__(self, capacity=DEFAULTCAPACITY):
+        self._capacity = capacity
+        self._x = np.empty(2 * capacity)
+        self._y = np.empty(2 * capacity)
+        self._head = 0
+        self._size = 0
+        # number of samples appended, including the overwritten ones
+        self._appended = 0
+
+    def capacity(self):
+        return self._capacity
+
+    def __len__(self):
+        return self._size
+
+    def append(self, x, y):
+        y = np.asarray(y, dtype=float)
+        self._appended += len(y)
+
+        x = np.asarray(x, dtype=float)[-self._capacity:]
+        y = y[-self._capacity:]
+        n = len(y)
+
+        if not n:
+            return
+
+        # samples that fit before the end of the buffer, the rest wraps
+        first = min(n, self._capacity - self._head)
+
+        for buffer, data in ((self._x, x), (self._y, y)):
+            for offset in (0, self._capacity):
+                start = offset + self._head
+                buffer[start:start + first] = data[:first]
+                buffer[offset:offset + n - first] = data[first:]
+
+        self._head = (self._head + n) % self._capacity
+        self._size = min(self._size + n, self._capacity)
+
+    def data(self):
+        start = (self._head - self._size) % self._capacity
+
+        return (self._x[start:start + self._size],
+                self._y[start:start + self._size])
+
+    def appended(self):
+        return self._appended
+
+    def since(self, appended):
+        """Views of the samples appended after the first appended ones. If
+        some of them were overwritten already, all buffered samples."""
+        x, y = self.data()
+        start = max(len(y) - (self._appended - appended), 0)
+
+        return x[start:], y[start:]
+
+    def clear(self):
+        self._head = 0
+        self._size = 0
+
+
+class ECGStream(QtCore.QObject):
+    """Collects the lines of a live client into blocks, runs the attached
+    streaming filters and beat detectors on every new block and keeps the
+    raw data, the filtered data and the detected peaks in ring buffers."""
+
+    BufferUpdated = QtCore.pyqtSignal()
+
+    def __init__(self, capacity=DEFAULTCAPACITY,
+                 flushInterval=DEFAULTFLUSHINTERVAL, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self._capacity = capacity
+        self._buffer = RingBuffer(capacity)
+
+        # {name: (streamingFilter, RingBuffer)}
+        self._filters = {}
+        # {name: (beatDetector, acceptedBuffer, rejectedBuffer)}
+        self._detectors = {}
+
+        self._pendingX = []
+        self._pendingY = []
+        self._sampleCount = 0
+
+        self._flushTimer = QtCore.QTimer(self)
+        self._flushTimer.setInterval(flushInterval)
+        self._flushTimer.timeout.connect(self.flush)
+
+    @QtCore.pyqtSlot(list)
+    def appendLine(self, values):
+        if not values:
+            return
+
+        if len(values) >= 2:
+            x, y = values[:2]
+
+        else:
+            # no timestamp, fall back to the sample count
+            x, y = self._sampleCount, values[0]
+
+        self._pendingX.append(x)
+        self._pendingY.append(y)
+        self._sampleCount += 1
+
+        if not self._flushTimer.isActive():
+            self._flushTimer.start()
+
+    @QtCore.pyqtSlot()
+    def flush(self):
+        if not self._pendingY:
+            self._flushTimer.stop()
+            return
+
+        x = np.asarray(self._pendingX, dtype=float)
+        y = np.asarray(self._pendingY, dtype=float)
+        self._pendingX, self._pendingY = [], []
+
+        self.appendBlock(x, y)
+
+    def appendBlock(self, x, y):
+        self._buffer.append(x, y)
+
+        for streamingFilter, buffer in self._filters.values():
+            buffer.append(x, streamingFilter.process(y))
+
+        for detector, accepted, rejected in self._detectors.values():
+            acceptedPeaks, rejectedPeaks = detector.process(x, y)
+            accepted.append(*acceptedPeaks)
+            rejected.append(*rejectedPeaks)
+
+        self.BufferUpdated.emit()
+
+    def attachFilter(self, name, streamingFilter):
+        if name in self._filters:
+            raise KeyError(f"Filter with name {name} already attached!")
+
+        self._filters[name] = (streamingFilter, RingBuffer(self._capacity))
+
+    def detachFilter(self, name):
+        del self._filters[name]
+
+    def filterNames(self):
+        return list(self._filters)
+
+    def buffer(self, name=None):
+        """RingBuffer of the raw data or, if name is given, of the output
+        of that filter"""
+        if name is None:
+            return self._buffer
+
+        return self._filters[name][1]
+
+    def attachBeatDetector(self, name, detector,
+                           peakCapacity=DEFAULTPEAKCAPACITY):
+        if name in self._detectors:
+            raise KeyError(f"Beat detector with name {name} already "
+                           "attached!")
+
+        self._detectors[name] = (detector, RingBuffer(peakCapacity),
+                                 RingBuffer(peakCapacity))
+
+    def detachBeatDetector(self, name):
+        del self._detectors[name]
+
+    def beatDetectorNames(self):
+        return list(self._detectors)
+
+    def peakBuffers(self, name):
+        """RingBuffers of the accepted and rejected peaks of the beat
+        detector name"""
+        _, accepted, rejected = self._detectors[name]
+
+        return accepted, rejected
+
+    def measures(self, name):
+        return self._detectors[name][0].measures
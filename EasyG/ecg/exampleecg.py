@@ -1,6 +1,5 @@
 import csv
 from pathlib import Path
-from scipy.misc import electrocardiogram
 import numpy as np
 
 from PyQt5.QtWidgets import QInputDialog
@@ -10,6 +9,13 @@ DEFAULTEXAMPLEPATH = Path.home() / "Projects/Python/EasyG/exampledata"
 
 
 def getSciPyExample():
+    try:
+        from scipy.datasets import electrocardiogram
+
+    except ImportError:
+        # scipy < 1.10
+        from scipy.misc import electrocardiogram
+
     y = electrocardiogram()
     # 5 Minute recording at 360Hz, we want millisecond timestamps
     x = np.linspace(start=0, stop=5 * 60 * 1000, num=5 * 60 * 360)
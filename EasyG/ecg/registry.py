@@ -0,0 +1,233 @@
+"""Registry of the processor, filter and data manipulation backends.
+
+Backends and their option widgets are registered as "module:attribute"
+strings and only imported the first time they are used, so heavy
+dependencies like heartpy or scipy.signal do not slow down the start up.
+
+Third party packages can add backends through the "easyg.plugins" entry
+point group. Every entry point has to refer to a function which takes the
+registry and registers its backends, e.g.
+
+    def register(registry):
+        registry.register("processor", "MyProcess", "mypackage.ecg:process",
+                          widget="mypackage.gui:MyProcessWidget",
+                          options={"sample_rate": REQUIRED})
+"""
+
+from importlib import import_module
+from importlib.metadata import entry_points
+
+
+ENTRYPOINTGROUP = "easyg.plugins"
+KINDS = ("processor", "filter", "manipulation")
+
+_PROCESSORWIDGETS = "EasyG.gui.plotmanager.datawidget.analyzewidget"
+
+
+class _Required(object):
+    def __repr__(self):
+        return "REQUIRED"
+
+
+# marks options without default in an option schema
+REQUIRED = _Required()
+
+
+def importObject(path):
+    """Import "module:attribute" and return the attribute"""
+    moduleName, _, attr = path.partition(":")
+    obj = import_module(moduleName)
+
+    for name in filter(None, attr.split(".")):
+        obj = getattr(obj, name)
+
+    return obj
+
+
+class BackendEntry(object):
+    """A registered backend. options is the option schema
+    {name: default}, use REQUIRED for options without default. Backends
+    accepting arbitrary options have no schema (None).
+
+    Processors may declare a streaming backend for live data, filters are
+    second order section designs with the signature of designFilter."""
+
+    def __init__(self, kind, name, backend, widget=None, options=None,
+                 streaming=None, description=""):
+        self.kind = kind
+        self.name = name
+        self.backend = backend
+        self.widget = widget
+        self.options = options
+        self.streaming = streaming
+        self.description = description
+
+        # {path: object} of everything imported so far
+        self._loaded = {}
+
+    def _import(self, path):
+        if path is None:
+            raise LookupError(f"{self.kind} {self.name} does not provide "
+                              "this backend!")
+
+        if path not in self._loaded:
+            self._loaded[path] = importObject(path)
+
+        return self._loaded[path]
+
+    def load(self):
+        return self._import(self.backend)
+
+    def loadWidget(self):
+        return self._import(self.widget)
+
+    def loadStreaming(self):
+        return self._import(self.streaming)
+
+    def hasStreaming(self):
+        return self.streaming is not None
+
+    def checkOptions(self, options):
+        """Options completed with the schema defaults"""
+        if self.options is None:
+            return dict(options)
+
+        unknown = set(options) - set(self.options)
+        if unknown:
+            raise ValueError(f"Unknown options for {self.kind} {self.name}: "
+                             f"{', '.join(sorted(unknown))}")
+
+        checked = dict(self.options)
+        checked.update(options)
+
+        missing = [k for k, v in checked.items() if v is REQUIRED]
+        if missing:
+            raise ValueError(f"Missing options for {self.kind} {self.name}: "
+                             f"{', '.join(missing)}")
+
+        return checked
+
+
+class BackendRegistry(object):
+    def __init__(self):
+        # {kind: {name: BackendEntry}} in order of registration
+        self._entries = {kind: {} for kind in KINDS}
+
+    def register(self, kind, name, backend, widget=None, options=None,
+                 streaming=None, description=""):
+        if kind not in self._entries:
+            raise ValueError(f"kind: {kind} is unknown, available are: "
+                             f"{', '.join(KINDS)}")
+
+        entry = BackendEntry(kind, name, backend, widget=widget,
+                             options=options, streaming=streaming,
+                             description=description)
+        self._entries[kind][name] = entry
+
+        return entry
+
+    def unregister(self, kind, name):
+        del self._entries[kind][name]
+
+    def names(self, kind):
+        return list(self._entries[kind])
+
+    def entries(self, kind):
+        return list(self._entries[kind].values())
+
+    def get(self, kind, name):
+        try:
+            return self._entries[kind][name]
+
+        except KeyError:
+            raise KeyError(f"No {kind} with name {name} registered!")
+
+    def load(self, kind, name):
+        return self.get(kind, name).load()
+
+    def loadEntryPoints(self, group=ENTRYPOINTGROUP):
+        try:
+            points = entry_points(group=group)
+
+        except TypeError:
+            # python < 3.10
+            points = entry_points().get(group, ())
+
+        for point in points:
+            point.load()(self)
+
+
+def registerBuiltins(registry):
+    processorWidgets = f"{_PROCESSORWIDGETS}.processorwidget"
+    filterWidgets = f"{_PROCESSORWIDGETS}.filterwidget"
+    manipulationWidgets = f"{_PROCESSORWIDGETS}.datamanipulationwidget"
+
+    heartPyOptions = {"sample_rate": REQUIRED,
+                      "windowsize": 0.75,
+                      "bpmmin": 40,
+                      "bpmmax": 180,
+                      "freq_method": "welch",
+                      "welch_wsize": 240}
+
+    registry.register(
+        "processor", "HeartPyProcess",
+        "EasyG.ecg.ecgprocessors:HeartPyProcess",
+        widget=f"{processorWidgets}:HeartPyProcessWidget",
+        options=heartPyOptions,
+        streaming="EasyG.ecg.ecgprocessors:StreamingBeatDetector",
+        description="heartpy")
+
+    registry.register(
+        "processor", "HeartPyParallelProcess",
+        "EasyG.ecg.ecgprocessors:HeartPyParallelProcess",
+        widget=f"{processorWidgets}:HeartPyParallelProcessWidget",
+        options=dict(heartPyOptions, segmentLength=300, segmentOverlap=10,
+                     maxWorkers=None),
+        streaming="EasyG.ecg.ecgprocessors:StreamingBeatDetector",
+        description="heartpy on segments in parallel processes")
+
+    registry.register(
+        "processor", "PanTompkinsProcess",
+        "EasyG.ecg.ecgprocessors:PanTompkinsProcess",
+        widget=f"{processorWidgets}:PanTompkinsProcessWidget",
+        options={"sample_rate": REQUIRED,
+                 "windowsize": 0.15,
+                 "passband": (5, 15),
+                 "refractory": 0.2,
+                 "freq_method": "welch",
+                 "welch_wsize": 240},
+        description="vectorized Pan-Tompkins QRS detection")
+
+    filterOptions = {"sample_rate": REQUIRED,
+                     "cutoff": REQUIRED,
+                     "order": 2}
+
+    for name, widget in (("lowpass", "SinglePassFilterWidget"),
+                         ("highpass", "SinglePassFilterWidget"),
+                         ("bandpass", "BandPassFilterWidget"),
+                         ("notch", "SinglePassFilterWidget")):
+        registry.register(
+            "filter", name, "EasyG.ecg.ecgfilters:designFilter",
+            widget=f"{filterWidgets}:{widget}",
+            options=dict(filterOptions),
+            description="butterworth" if name != "notch" else "iir notch")
+
+    registry.register(
+        "manipulation", "Resample", "EasyG.ecg.ecgmanipulations:Resample",
+        widget=f"{manipulationWidgets}:ResampleWidget",
+        options={"factor": True, "num": REQUIRED},
+        description="rational polyphase resampling")
+
+
+_REGISTRY = None
+
+
+def getRegistry():
+    global _REGISTRY
+
+    if _REGISTRY is None:
+        _REGISTRY = BackendRegistry()
+        registerBuiltins(_REGISTRY)
+        _REGISTRY.loadEntryPoints()
+
+    return _REGISTRY
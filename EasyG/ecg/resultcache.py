@@ -0,0 +1,132 @@
+from collections import OrderedDict
+import hashlib
+import json
+import sys
+import threading
+
+import numpy as np
+
+from EasyG.config import getConfig
+
+
+DEFAULTMAXBYTES = 256 * 1024 ** 2
+
+
+def _normalize(obj):
+    # json friendly, order independent representation of options
+    if isinstance(obj, dict):
+        obj = {str(k): _normalize(v) for k, v in obj.items()}
+
+    elif isinstance(obj, (list, tuple)):
+        obj = [_normalize(o) for o in obj]
+
+    elif isinstance(obj, np.generic):
+        obj = obj.item()
+
+    elif obj is not None and not isinstance(obj, (str, int, float, bool)):
+        obj = repr(obj)
+
+    return obj
+
+
+def sizeOf(obj):
+    if isinstance(obj, np.ndarray):
+        size = obj.nbytes
+
+    elif isinstance(obj, dict):
+        size = sys.getsizeof(obj) + sum(sizeOf(k) + sizeOf(v)
+                                        for k, v in obj.items())
+
+    elif isinstance(obj, (list, tuple)):
+        size = sys.getsizeof(obj) + sum(sizeOf(o) for o in obj)
+
+    else:
+        size = sys.getsizeof(obj)
+
+    return size
+
+
+class ResultCache(object):
+    """Content addressed LRU cache for filter and processing results.
+    Least recently used results are evicted once the cache grows beyond
+    maxBytes. Cached results are shared, users must not modify them."""
+
+    def __init__(self, maxBytes=DEFAULTMAXBYTES):
+        self._maxBytes = maxBytes
+        self._nbytes = 0
+
+        # {key: (result, size)}, oldest first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def makeKey(dataVersion, bounds, operation, options):
+        key = json.dumps(_normalize([dataVersion, bounds, operation, options]),
+                         sort_keys=True)
+
+        return hashlib.sha1(key.encode()).hexdigest()
+
+    def maxBytes(self):
+        return self._maxBytes
+
+    def setMaxBytes(self, maxBytes):
+        with self._lock:
+            self._maxBytes = maxBytes
+            self._evict()
+
+    def nbytes(self):
+        return self._nbytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+
+            self._entries.move_to_end(key)
+
+            return self._entries[key][0]
+
+    def put(self, key, result):
+        size = sizeOf(result)
+
+        with self._lock:
+            if key in self._entries:
+                self._nbytes -= self._entries.pop(key)[1]
+
+            if size > self._maxBytes:
+                # would evict everything else and still not fit
+                return
+
+            self._entries[key] = (result, size)
+            self._nbytes += size
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def _evict(self):
+        while self._nbytes > self._maxBytes and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self._nbytes -= size
+
+
+_RESULTCACHE = None
+
+
+def getResultCache():
+    global _RESULTCACHE
+
+    if _RESULTCACHE is None:
+        maxBytes = getConfig().getint("cache", "max bytes",
+                                      fallback=DEFAULTMAXBYTES)
+        _RESULTCACHE = ResultCache(maxBytes=maxBytes)
+
+    return _RESULTCACHE
@@ -1,29 +1,249 @@
+from itertools import count
+import threading
+
 from PyQt5 import QtCore
 
 
-class ProxyECGWorkerSignals(QtCore.QObject):
-    WorkerFinished = QtCore.pyqtSignal(object)
-    WorkerFailed = QtCore.pyqtSignal(Exception)
+class JobCancelledError(Exception):
+    pass
+
+
+class CancellationToken(object):
+    """Cooperative cancellation flag shared between a job and its owner.
+    Long running job functions may poll it (or call raiseIfCancelled)
+    to stop early."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    def isCancelled(self):
+        return self._event.is_set()
+
+    def raiseIfCancelled(self):
+        if self.isCancelled():
+            raise JobCancelledError("Job has been cancelled")
+
+
+class ECGWorkerSignals(QtCore.QObject):
+    # jobID, result
+    WorkerFinished = QtCore.pyqtSignal(int, object)
+    # jobID, error
+    WorkerFailed = QtCore.pyqtSignal(int, Exception)
+    # jobID
+    WorkerCancelled = QtCore.pyqtSignal(int)
 
 
 class ECGWorker(QtCore.QRunnable):
-    _Signals = ProxyECGWorkerSignals()
+    _jobIDs = count()
+
+    def __init__(self, fn, fnArgs=(), fnKwargs=None, priority=0,
+                 passCancelToken=False):
+        super().__init__()
+        # the owning ECGWorkerPool keeps us alive until we are done
+        self.setAutoDelete(False)
 
-    def __init__(self, fn, fnArgs, fnKwargs):
         self.fn = fn
-        self.fnArgs = fnArgs
-        self.fnKwargs = fnKwargs
+        self.fnArgs = tuple(fnArgs)
+        self.fnKwargs = dict(fnKwargs or {})
+
+        self.jobID = next(ECGWorker._jobIDs)
+        self.priority = priority
+        self.cancelToken = CancellationToken()
+
+        if passCancelToken:
+            self.fnKwargs["cancelToken"] = self.cancelToken
+
+        # every job gets its own signals so results can not get mixed up
+        self.signals = ECGWorkerSignals()
 
     def __getattr__(self, attr):
-        # defer signal lookup to the ProxySignal class
-        return getattr(self._Signals, attr)
+        # defer signal lookup to the per job signal object
+        if attr == "signals":
+            raise AttributeError(attr)
+
+        return getattr(self.signals, attr)
+
+    def cancel(self):
+        self.cancelToken.cancel()
+
+    def isCancelled(self):
+        return self.cancelToken.isCancelled()
 
     def run(self):
+        if self.isCancelled():
+            self.WorkerCancelled.emit(self.jobID)
+            return
+
         try:
             result = self.fn(*self.fnArgs, **self.fnKwargs)
 
+        except JobCancelledError:
+            self.WorkerCancelled.emit(self.jobID)
+
         except Exception as err:
-            self.WorkerFailed.emit(err)
+            self.WorkerFailed.emit(self.jobID, err)
 
         else:
-            self.WorkerFinished.emit(result)
+            if self.isCancelled():
+                # result is stale, nobody wants it anymore
+                self.WorkerCancelled.emit(self.jobID)
+
+            else:
+                self.WorkerFinished.emit(self.jobID, result)
+
+
+class ECGWorkerPool(QtCore.QObject):
+    """Submits ECGWorkers to a QThreadPool and keeps track of them until
+    they are done. The per job signals are forwarded as Job* signals so
+    users can match results by jobID without connecting to every job."""
+
+    # jobID, result
+    JobFinished = QtCore.pyqtSignal(int, object)
+    # jobID, error
+    JobFailed = QtCore.pyqtSignal(int, Exception)
+    # jobID
+    JobCancelled = QtCore.pyqtSignal(int)
+
+    def __init__(self, threadPool=None, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        if threadPool is None:
+            threadPool = QtCore.QThreadPool.globalInstance()
+
+        self._threadPool = threadPool
+
+        # {jobID: worker} of all queued or running jobs
+        self._workers = {}
+
+    def submit(self, fn, fnArgs=(), fnKwargs=None, priority=0,
+               passCancelToken=False):
+        worker = ECGWorker(fn=fn, fnArgs=fnArgs, fnKwargs=fnKwargs,
+                           priority=priority,
+                           passCancelToken=passCancelToken)
+
+        return self.start(worker)
+
+    def start(self, worker):
+        # connect before starting, otherwise fast jobs might finish before
+        # anybody listens
+        worker.WorkerFinished.connect(self._onWorkerFinished)
+        worker.WorkerFailed.connect(self._onWorkerFailed)
+        worker.WorkerCancelled.connect(self._onWorkerCancelled)
+
+        self._workers[worker.jobID] = worker
+        self._threadPool.start(worker, worker.priority)
+
+        return worker
+
+    def worker(self, jobID):
+        return self._workers.get(jobID)
+
+    def activeJobIDs(self):
+        return list(self._workers)
+
+    def cancel(self, jobID):
+        worker = self._workers.get(jobID)
+
+        if worker is not None:
+            worker.cancel()
+
+            if self._threadPool.tryTake(worker):
+                # job was still queued and never ran
+                self._onWorkerCancelled(jobID)
+
+    def cancelAll(self):
+        for jobID in self.activeJobIDs():
+            self.cancel(jobID)
+
+    def _releaseWorker(self, jobID):
+        # release on the next event loop iteration, there might be other
+        # receivers of the current signal emission of this worker
+        QtCore.QTimer.singleShot(0, lambda: self._workers.pop(jobID, None))
+
+    @QtCore.pyqtSlot(int, object)
+    def _onWorkerFinished(self, jobID, result):
+        self._releaseWorker(jobID)
+        self.JobFinished.emit(jobID, result)
+
+    @QtCore.pyqtSlot(int, Exception)
+    def _onWorkerFailed(self, jobID, err):
+        self._releaseWorker(jobID)
+        self.JobFailed.emit(jobID, err)
+
+    @QtCore.pyqtSlot(int)
+    def _onWorkerCancelled(self, jobID):
+        self._releaseWorker(jobID)
+        self.JobCancelled.emit(jobID)
+
+
+class ECGJobScheduler(ECGWorkerPool):
+    """ECGWorkerPool that coalesces jobs by key. Submitting a job with the
+    key of a job which is still queued or running supersedes that job:
+    it is cancelled and its results are dropped, even if they arrive."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # {key: jobID} of the latest job submitted per key
+        self._latestJobs = {}
+        # {jobID: key}
+        self._jobKeys = {}
+
+    def submit(self, fn, fnArgs=(), fnKwargs=None, priority=0,
+               passCancelToken=False, key=None):
+        if key is not None:
+            self.cancelKey(key)
+
+        worker = super().submit(fn=fn, fnArgs=fnArgs, fnKwargs=fnKwargs,
+                                priority=priority,
+                                passCancelToken=passCancelToken)
+
+        if key is not None:
+            self._latestJobs[key] = worker.jobID
+            self._jobKeys[worker.jobID] = key
+
+        return worker
+
+    def cancelKey(self, key):
+        if key in self._latestJobs:
+            self.cancel(self._latestJobs[key])
+
+    def isLatestJob(self, jobID):
+        key = self._jobKeys.get(jobID)
+
+        return key is None or self._latestJobs.get(key) == jobID
+
+    def _forgetJob(self, jobID):
+        key = self._jobKeys.pop(jobID, None)
+
+        if key is not None and self._latestJobs.get(key) == jobID:
+            del self._latestJobs[key]
+
+    @QtCore.pyqtSlot(int, object)
+    def _onWorkerFinished(self, jobID, result):
+        if self.isLatestJob(jobID):
+            self._forgetJob(jobID)
+            super()._onWorkerFinished(jobID, result)
+
+        else:
+            # superseded while its result was already on the way
+            self._forgetJob(jobID)
+            super()._onWorkerCancelled(jobID)
+
+    @QtCore.pyqtSlot(int, Exception)
+    def _onWorkerFailed(self, jobID, err):
+        if self.isLatestJob(jobID):
+            self._forgetJob(jobID)
+            super()._onWorkerFailed(jobID, err)
+
+        else:
+            self._forgetJob(jobID)
+            super()._onWorkerCancelled(jobID)
+
+    @QtCore.pyqtSlot(int)
+    def _onWorkerCancelled(self, jobID):
+        self._forgetJob(jobID)
+        super()._onWorkerCancelled(jobID)
@@ -0,0 +1,140 @@
+import numpy as np
+
+
+DEFAULTBUFFERCAPACITY = 2 ** 12
+
+
+class TimeSeries(object):
+    """Values y at sorted timestamps x. Range queries are binary searches
+    and return views sharing the memory of the series. Unsorted timestamps
+    are sorted (copying the data) once on construction."""
+
+    def __init__(self, x, y):
+        x = np.asarray(x)
+        y = np.asarray(y)
+
+        if x.ndim != 1 or x.shape != y.shape:
+            raise ValueError("x and y need to be one dimensional arrays "
+                             "of the same length!")
+
+        if len(x) > 1 and np.any(x[1:] < x[:-1]):
+            order = np.argsort(x, kind="stable")
+            x, y = x[order], y[order]
+
+        self.x = x
+        self.y = y
+
+    def __len__(self):
+        return len(self.x)
+
+    def __iter__(self):
+        # allows x, y = series
+        yield self.x
+        yield self.y
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self.x[index], self.y[index]
+
+        return TimeSeries._view(self.x[index], self.y[index])
+
+    @staticmethod
+    def _view(x, y):
+        # without the checks, x and y are known to be fine
+        series = TimeSeries.__new__(TimeSeries)
+        series.x = x
+        series.y = y
+
+        return series
+
+    def indices(self, start=None, stop=None):
+        """slice of the samples with start <= x <= stop, None is unbounded"""
+        lower = 0 if start is None else np.searchsorted(self.x, start, "left")
+        upper = (len(self.x) if stop is None
+                 else np.searchsorted(self.x, stop, "right"))
+
+        return slice(int(lower), int(max(lower, upper)))
+
+    def between(self, start=None, stop=None):
+        """View of the samples with start <= x <= stop"""
+        return self[self.indices(start, stop)]
+
+
+class TimeSeriesBuffer(object):
+    """Append only TimeSeries with preallocated capacity. Appending costs
+    amortized O(number of appended samples), series() returns views of the
+    buffer. With maxLength, the oldest samples are dropped once the buffer
+    is full, keeping at least the last maxLength and at most twice as many
+    samples."""
+
+    def __init__(self, x=None, y=None, capacity=DEFAULTBUFFERCAPACITY,
+                 maxLength=None):
+        x = np.asarray(() if x is None else x, dtype=float)
+        y = np.asarray(() if y is None else y, dtype=float)
+        series = TimeSeries(x, y)
+
+        self._maxLength = maxLength
+        if maxLength is not None:
+            series = series[max(len(series) - maxLength, 0):]
+            capacity = min(capacity, 2 * maxLength)
+
+        capacity = max(capacity, 2 * len(series))
+        self._x = np.empty(capacity)
+        self._y = np.empty(capacity)
+
+        self._size = len(series)
+        self._x[:self._size] = series.x
+        self._y[:self._size] = series.y
+
+    def __len__(self):
+        return self._size
+
+    def capacity(self):
+        return len(self._x)
+
+    def append(self, x, y):
+        x = np.asarray(x, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+
+        if len(x) != len(y):
+            raise ValueError("x and y need to have the same length!")
+
+        if not len(x):
+            return
+
+        if (np.any(x[1:] < x[:-1])
+                or (self._size and x[0] < self._x[self._size - 1])):
+            raise ValueError("Appended samples need to be sorted and must "
+                             "not precede the buffered ones!")
+
+        if self._maxLength is not None:
+            x, y = x[-self._maxLength:], y[-self._maxLength:]
+
+        if self._size + len(x) > len(self._x):
+            self._reallocate(len(x))
+
+        size = self._size + len(x)
+        self._x[self._size:size] = x
+        self._y[self._size:size] = y
+        self._size = size
+
+    def _reallocate(self, needed):
+        # new arrays, the views handed out keep their data
+        keep = self._size
+        capacity = max(2 * len(self._x), keep + needed)
+
+        if self._maxLength is not None:
+            if keep + needed > 2 * self._maxLength:
+                keep = max(self._maxLength - needed, 0)
+
+            capacity = min(capacity, 2 * self._maxLength)
+
+        for name in ("_x", "_y"):
+            data = np.empty(capacity)
+            data[:keep] = getattr(self, name)[self._size - keep:self._size]
+            setattr(self, name, data)
+
+        self._size = keep
+
+    def series(self):
+        return TimeSeries._view(self._x[:self._size], self._y[:self._size])
@@ -36,18 +36,9 @@ class GUIHandler(QtCore.QObject):
 
     @QtCore.pyqtSlot(dict, dict)
     def onProcessButtonPressed(self, dataOptions, processOptions):
-        start, stop = dataOptions["data bounds"]
         plotManager = self.gui.centralWidget().currentWidget()
-        x, y = plotManager.getGlobalPlotItem(
-            dataOptions["data source"]).getData()
-
-        if start is not None:
-            start = next(idx for idx, v in enumerate(x) if v >= start)
-
-        if stop is not None:
-            stop = next(idx for idx, v in enumerate(x) if v >= stop)
-
-        x, y = x[start:stop], y[start:stop]
+        x, y = plotManager.dataStore.series(
+            dataOptions["data source"]).between(*dataOptions["data bounds"])
 
         dataOptions["plot manager"] = plotManager
 
@@ -95,18 +86,8 @@ class GUIHandler(QtCore.QObject):
 
     @QtCore.pyqtSlot(object, dict, dict)
     def onFilterButtonPressed(self, plotManager, dataOptions, filterOptions):
-        x, y = plotManager.getGlobalPlotItem(
-            dataOptions["data source"]).getData()
-
-        start, stop = dataOptions["data bounds"]
-
-        if start is not None:
-            start = next(idx for idx, v in enumerate(x) if v >= start)
-
-        if stop is not None:
-            stop = next(idx for idx, v in enumerate(x) if v >= stop)
-
-        x, y = x[start:stop], y[start:stop]
+        x, y = plotManager.dataStore.series(
+            dataOptions["data source"]).between(*dataOptions["data bounds"])
 
         dataOptions["plot manager"] = plotManager
 
@@ -133,21 +114,12 @@ class GUIHandler(QtCore.QObject):
 
     def onDataManipulationButtonPressed(self, plotManager, dataOptions,
                                         manipulationOptions):
-        x, y = plotManager.getGlobalPlotItem(
-            dataOptions["data source"]).getData()
+        series = plotManager.dataStore.series(dataOptions["data source"])
 
         if manipulationOptions.pop("factor"):
-            manipulationOptions["num"] = len(x) * manipulationOptions["num"]
-
-        start, stop = dataOptions["data bounds"]
-
-        if start is not None:
-            start = next(idx for idx, v in enumerate(x) if v >= start)
-
-        if stop is not None:
-            stop = next(idx for idx, v in enumerate(x) if v >= stop)
+            manipulationOptions["num"] *= len(series)
 
-        x, y = x[start:stop], y[start:stop]
+        x, y = series.between(*dataOptions["data bounds"])
 
         dataOptions["plot manager"] = plotManager
 
@@ -5,17 +5,8 @@ class PlotDataHandler(object):
         self.plotManger = plotMangerWidget
 
     def _onProcessButtonPressed(self, dataOptions, processOptions):
-        start, stop = dataOptions["data bounds"]
-        x, y = self.plotManager.getGlobalPlotItem(
-            dataOptions["data source"]).getData()
-
-        if start is not None:
-            start = next(idx for idx, v in enumerate(x) if v >= start)
-
-        if stop is not None:
-            stop = next(idx for idx, v in enumerate(x) if v >= stop)
-
-        x, y = x[start:stop], y[start:stop]
+        x, y = self.plotManager.dataStore.series(
+            dataOptions["data source"]).between(*dataOptions["data bounds"])
 
         self._analysisWorker.StartProcessing.emit(
             processOptions.pop("processor"),        # target Process
@@ -1,38 +1,64 @@
 from PyQt5 import QtCore
 from PyQt5 import QtWidgets
 
-from EasyG.gui.plotmanager.plotmanagerwidget import PlotManagerWidget
-from EasyG.ecg import exampleecg
+from .nameregistry import NameRegistry
 
 
 class CentralWidget(QtWidgets.QTabWidget):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+        # the tab widgets by tab name
+        self._tabs = NameRegistry()
+        # only the current tab is plotting, the others are paused
+        self._currentTab = None
+
         self.setTabsClosable(True)
         self.tabCloseRequested.connect(self.removeTab)
+        self.currentChanged.connect(self._onCurrentChanged)
 
-    def widgetFromTabName(self, tabName):
-        widget = None
+    def addTab(self, widget, tabName):
+        return self.insertTab(self.count(), widget, tabName)
 
-        for idx in range(self.count()):
-            if self.tabText(idx) == tabName:
-                widget = self.widget(idx)
-                break
+    def insertTab(self, index, widget, tabName):
+        self._tabs.add(tabName, widget)
 
-        return widget
+        index = super().insertTab(index, widget, tabName)
 
-    def _getUniqueTabName(self, defaultName):
-        i = 0
-        name = defaultName
-        while self.widgetFromTabName(name) is not None:
-            i += 1
-            name = f"{defaultName} ({i})"
+        if widget is not self.currentWidget():
+            _setPaused(widget, True)
+
+        return index
+
+    def removeTab(self, index):
+        self._tabs.remove(self.tabText(index))
+        super().removeTab(index)
+
+    def setTabText(self, index, tabName):
+        self._tabs.rename(self.tabText(index), tabName)
+        super().setTabText(index, tabName)
+
+    @QtCore.pyqtSlot(int)
+    def _onCurrentChanged(self, index):
+        widget = self.widget(index)
 
-        return name
+        if widget is not self._currentTab:
+            _setPaused(self._currentTab, True)
+            _setPaused(widget, False)
+            self._currentTab = widget
+
+    def widgetFromTabName(self, tabName):
+        return self._tabs.get(tabName)
+
+    def _getUniqueTabName(self, defaultName):
+        return self._tabs.uniqueName(defaultName)
 
     @QtCore.pyqtSlot(str)
     def newMainPlotTab(self, tabName, x, y, plotName, plotterName="Main Plot"):
+        # pyqtgraph, numpy and the analysis widgets are only needed once the
+        # first plot is shown, keep them out of the start up
+        from EasyG.gui.plotmanager.plotmanagerwidget import PlotManagerWidget
+
         widget = PlotManagerWidget()
 
         widget.insertColumn()
@@ -48,6 +74,12 @@ class CentralWidget(QtWidgets.QTabWidget):
         return widget
 
 
+def _setPaused(widget, paused):
+    # not every tab can be paused
+    if hasattr(widget, "setPaused"):
+        widget.setPaused(paused)
+
+
 class MainWindow(QtWidgets.QMainWindow):
     # tabName, tabOptions
     NewTabRequest = QtCore.pyqtSignal(str, dict)
@@ -101,6 +133,8 @@ class MainWindow(QtWidgets.QMainWindow):
         serverMenu()
 
     def openExample(self):
+        from EasyG.ecg import exampleecg
+
         x, y, exampleName = exampleecg.openExample()
 
         tabName = f"{exampleName} Example"
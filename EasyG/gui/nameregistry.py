@@ -0,0 +1,75 @@
+class NameRegistry(object):
+    """Unique names of objects (plots, plot items, tabs, ...) with constant
+    time lookups. Unique names are the base name with a suffix, e.g.
+    "data (2)". The next free suffix of every base name is remembered, so
+    making up a unique name does not test all the taken ones."""
+
+    def __init__(self, suffixFormat="{name} ({i})"):
+        self.suffixFormat = suffixFormat
+
+        # {name: object}
+        self._objects = {}
+        # {id(object): name}
+        self._names = {}
+        # {base name: next suffix to try}
+        self._nextSuffix = {}
+
+    def __contains__(self, name):
+        return name in self._objects
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __iter__(self):
+        return iter(self._objects)
+
+    def __getitem__(self, name):
+        return self._objects[name]
+
+    def get(self, name, default=None):
+        return self._objects.get(name, default)
+
+    def objects(self):
+        return list(self._objects.values())
+
+    def nameOf(self, obj):
+        return self._names.get(id(obj))
+
+    def add(self, name, obj):
+        if name in self._objects:
+            raise KeyError(f"Name {name} already taken!")
+
+        self._objects[name] = obj
+        self._names[id(obj)] = name
+
+    def remove(self, name):
+        obj = self._objects.pop(name)
+        del self._names[id(obj)]
+
+        return obj
+
+    def rename(self, name, newName):
+        if newName == name:
+            return
+
+        if newName in self._objects:
+            raise KeyError(f"Name {newName} already taken!")
+
+        obj = self.remove(name)
+        self.add(newName, obj)
+
+    def uniqueName(self, name):
+        """name, or name with a suffix if it is taken"""
+        if name not in self._objects:
+            return name
+
+        i = self._nextSuffix.get(name, 1)
+        unique = self.suffixFormat.format(name=name, i=i)
+
+        while unique in self._objects:
+            i += 1
+            unique = self.suffixFormat.format(name=name, i=i)
+
+        self._nextSuffix[name] = i + 1
+
+        return unique
@@ -1,5 +1,7 @@
 from PyQt5 import QtWidgets, QtCore, QtGui
 
+from EasyG.ecg.registry import getRegistry
+
 
 class ResampleWidget(QtWidgets.QGroupBox):
     OptionsChanged = QtCore.pyqtSignal()
@@ -13,7 +15,8 @@ class ResampleWidget(QtWidgets.QGroupBox):
         samplePointsLayout = QtWidgets.QVBoxLayout()
         self.newSamplePointsLineEdit = QtWidgets.QLineEdit()
         self.newSamplePointsLineEdit.textChanged.connect(self.OptionsChanged)
-        self.newSamplePointsLineEdit.setValidator(QtGui.QIntValidator())
+        # factors may be fractional to downsample
+        self.newSamplePointsLineEdit.setValidator(QtGui.QDoubleValidator())
         self.newSamplePointsLineEdit.setText("2")
         samplePointsLayout.addWidget(self.newSamplePointsLineEdit)
 
@@ -26,9 +29,10 @@ class ResampleWidget(QtWidgets.QGroupBox):
     def currentOptions(self):
         checkState = self.newSamplePointsFactorCheckBox.checkState()
         factor = checkState == QtCore.Qt.Checked
+        num = float(self.newSamplePointsLineEdit.text())
         return {
             "factor": factor,
-            "num": int(self.newSamplePointsLineEdit.text())
+            "num": num if factor else int(num)
         }
 
     def anyOptionEmpty(self):
@@ -36,10 +40,6 @@ class ResampleWidget(QtWidgets.QGroupBox):
 
 
 class DataManipulationWidget(QtWidgets.QGroupBox):
-    manipulationMethods = {
-        "Resample": ResampleWidget
-    }
-
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -49,14 +49,13 @@ class DataManipulationWidget(QtWidgets.QGroupBox):
         self.setLayout(layout)
 
         self.manipulationMethods = QtWidgets.QComboBox()
-        self.manipulationMethods.addItems(
-            DataManipulationWidget.manipulationMethods)
         layout.addWidget(self.manipulationMethods)
 
         self.stackedManipulationLayout = QtWidgets.QStackedLayout()
-        for widget in DataManipulationWidget.manipulationMethods.values():
-            widget = widget()
+        for entry in getRegistry().entries("manipulation"):
+            widget = entry.loadWidget()()
             widget.OptionsChanged.connect(self._monitorApplyButton)
+            self.manipulationMethods.addItem(entry.name)
             self.stackedManipulationLayout.addWidget(widget)
         layout.addLayout(self.stackedManipulationLayout)
         self.manipulationMethods.currentIndexChanged.connect(
@@ -2,10 +2,12 @@ from PyQt5 import QtWidgets, QtGui, QtCore
 from PyQt5.QtCore import Qt
 
 from EasyG.config import getAnalyzeWidgetConfig
+from EasyG.ecg.ecgfilters import (FilterPipeline, loadPipelinePresets,
+                                  savePipelinePreset)
+from EasyG.ecg.registry import getRegistry
 from ...layoutwidget.buttons import CheckableLineEdit
 
 _ANALYZECONFIG = getAnalyzeWidgetConfig()
-_AVAILABLEFILTERS = _ANALYZECONFIG["FilterWidget"]
 _FILTERCONFIG = _ANALYZECONFIG["FilterWidget.Options"]
 
 
@@ -105,11 +107,10 @@ class DataFilterWidget(QtWidgets.QGroupBox):
         layout.addWidget(self.availableFilters)
 
         self.stackedFilterLayout = QtWidgets.QStackedLayout()
-        for fltrName, fltr in _AVAILABLEFILTERS.items():
-            fltr = globals()[f"{fltr}FilterWidget"]
-            fltr = fltr()
+        for entry in getRegistry().entries("filter"):
+            fltr = entry.loadWidget()()
             fltr.OptionsChanged.connect(self._monitorApplyButton)
-            self.availableFilters.addItem(fltrName)
+            self.availableFilters.addItem(entry.name)
             self.stackedFilterLayout.addWidget(fltr)
         self.stackedFilterLayout.currentChanged.connect(
             self._monitorApplyButton)
@@ -118,18 +119,109 @@ class DataFilterWidget(QtWidgets.QGroupBox):
             self.stackedFilterLayout.setCurrentIndex)
         layout.addLayout(self.stackedFilterLayout)
 
+        self._initPipelineWidgets(layout)
+
         self.applyButton = QtWidgets.QPushButton()
         self.applyButton.setText("Apply")
         self.applyButton.setSizePolicy(QtWidgets.QSizePolicy.Preferred,
                                        QtWidgets.QSizePolicy.Minimum)
         layout.addWidget(self.applyButton, alignment=Qt.AlignRight)
 
+    def _initPipelineWidgets(self, layout):
+        # filter stages applied in one pass, the current filter options are
+        # used as single stage if the pipeline is empty
+        self.pipeline = FilterPipeline()
+
+        self.pipelineList = QtWidgets.QListWidget()
+        self.pipelineList.setMaximumHeight(80)
+        layout.addWidget(self.pipelineList)
+
+        stageButtonLayout = QtWidgets.QHBoxLayout()
+        self.addStageButton = QtWidgets.QPushButton("Add stage")
+        self.addStageButton.pressed.connect(self.addCurrentStage)
+        stageButtonLayout.addWidget(self.addStageButton)
+
+        self.removeStageButton = QtWidgets.QPushButton("Remove stage")
+        self.removeStageButton.pressed.connect(self.removeSelectedStage)
+        stageButtonLayout.addWidget(self.removeStageButton)
+        layout.addLayout(stageButtonLayout)
+
+        presetLayout = QtWidgets.QHBoxLayout()
+        self.presets = QtWidgets.QComboBox()
+        self.presets.setPlaceholderText("Presets")
+        self.presets.addItems(loadPipelinePresets())
+        self.presets.textActivated.connect(self.loadPreset)
+        presetLayout.addWidget(self.presets, 1)
+
+        self.savePresetButton = QtWidgets.QPushButton("Save preset")
+        self.savePresetButton.pressed.connect(self.saveCurrentPipeline)
+        presetLayout.addWidget(self.savePresetButton)
+        layout.addLayout(presetLayout)
+
+        self.addStageButton.setEnabled(False)
+
+    def _updatePipelineList(self):
+        self.pipelineList.clear()
+
+        for stage in self.pipeline:
+            self.pipelineList.addItem(
+                f"{stage['filtertype']}: {stage['cutoff']} Hz, "
+                f"order {stage['order']}")
+
+        self._monitorApplyButton()
+
+    def addCurrentStage(self):
+        self.pipeline.addStage(self.currentOptions())
+        self._updatePipelineList()
+
+    def removeSelectedStage(self):
+        row = self.pipelineList.currentRow()
+
+        if row != -1:
+            self.pipeline.removeStage(row)
+            self._updatePipelineList()
+
+    def loadPreset(self, name):
+        preset = loadPipelinePresets().get(name)
+
+        if preset is not None:
+            self.pipeline = preset
+            self._updatePipelineList()
+
+    def saveCurrentPipeline(self):
+        pipeline = self.currentPipeline()
+
+        name, isValid = QtWidgets.QInputDialog.getText(
+            self,
+            "Save filter preset",
+            "Preset name:",
+            text=pipeline.name or pipeline.description())
+
+        name = name.strip()
+
+        if isValid and name:
+            try:
+                savePipelinePreset(name, pipeline)
+
+            except ValueError as err:
+                QtWidgets.QMessageBox.warning(self,
+                                              "Saving preset failed!",
+                                              str(err),
+                                              QtWidgets.QMessageBox.Ok)
+                return
+
+            if self.presets.findText(name) == -1:
+                self.presets.addItem(name)
+
     def setSamplingRate(self, rate):
         for idx in range(self.stackedFilterLayout.count()):
             self.stackedFilterLayout.widget(idx).setSamplingRate(rate)
 
     def _monitorApplyButton(self):
-        if self.stackedFilterLayout.currentWidget().anyOptionEmpty():
+        optionEmpty = self.stackedFilterLayout.currentWidget().anyOptionEmpty()
+        self.addStageButton.setEnabled(not optionEmpty)
+
+        if optionEmpty and not len(self.pipeline):
             self.applyButton.setEnabled(False)
 
         else:
@@ -138,6 +230,16 @@ class DataFilterWidget(QtWidgets.QGroupBox):
     def currentOptions(self):
         filterType = self.availableFilters.currentText()
         opts = self.stackedFilterLayout.currentWidget().getFilterOptions()
+        opts = getRegistry().get("filter", filterType).checkOptions(opts)
         opts["filtertype"] = filterType
 
         return opts
+
+    def currentPipeline(self):
+        if len(self.pipeline):
+            pipeline = FilterPipeline(self.pipeline, name=self.pipeline.name)
+
+        else:
+            pipeline = FilterPipeline([self.currentOptions()])
+
+        return pipeline
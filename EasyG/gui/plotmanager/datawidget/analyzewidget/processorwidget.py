@@ -2,15 +2,21 @@ from PyQt5 import QtWidgets, QtGui, QtCore
 from PyQt5.QtCore import Qt
 
 from EasyG.config import getAnalyzeWidgetConfig
+from EasyG.ecg.registry import getRegistry
 from ...layoutwidget.buttons import CheckableLineEdit
 
 _ANALYZECONFIG = getAnalyzeWidgetConfig()
 _HEARTPYPROCESSCONFIG = _ANALYZECONFIG["Processor.HeartPyProcess"]
+_HEARTPYPARALLELPROCESSCONFIG = _ANALYZECONFIG[
+    "Processor.HeartPyParallelProcess"]
+_PANTOMPKINSPROCESSCONFIG = _ANALYZECONFIG["Processor.PanTompkinsProcess"]
 
 
 class HeartPyProcessWidget(QtWidgets.QGroupBox):
     OptionsChanged = QtCore.pyqtSignal()
 
+    config = _HEARTPYPROCESSCONFIG
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -25,19 +31,18 @@ class HeartPyProcessWidget(QtWidgets.QGroupBox):
         self.windowSize = QtWidgets.QLineEdit()
         self.windowSize.textChanged.connect(self.OptionsChanged)
         self.windowSize.setValidator(QtGui.QDoubleValidator())
-        self.windowSize.setText(_HEARTPYPROCESSCONFIG["window size"])
+        self.windowSize.setText(self.config["window size"])
         layout.addRow("Window size:", self.windowSize)
 
         self.frequencyMethod = QtWidgets.QComboBox()
         self.frequencyMethod.addItems(
-            _HEARTPYPROCESSCONFIG.getlist("frequency methods"))
+            self.config.getlist("frequency methods"))
         layout.addRow("Frequency method:", self.frequencyMethod)
 
         self.welchWindowSize = QtWidgets.QLineEdit()
         self.welchWindowSize.textChanged.connect(self.OptionsChanged)
         self.welchWindowSize.setValidator(QtGui.QDoubleValidator())
-        self.welchWindowSize.setText(_HEARTPYPROCESSCONFIG.get(
-            "welch windowsize"))
+        self.welchWindowSize.setText(self.config.get("welch windowsize"))
         layout.addRow("Welch window size:", self.welchWindowSize)
 
     def getProcessOptions(self):
@@ -54,14 +59,52 @@ class HeartPyProcessWidget(QtWidgets.QGroupBox):
                 or not self.welchWindowSize.text())
 
 
-class ProcessOptionsWidget(QtWidgets.QGroupBox):
-    availableProcessors = {}
-    for section in _ANALYZECONFIG:
-        if section is not None and section.startswith("Processor."):
-            # new ProcessorWidget
-            name = section.removeprefix("Processor.")
-            availableProcessors[name] = globals()[name + "Widget"]
+class HeartPyParallelProcessWidget(HeartPyProcessWidget):
+    config = _HEARTPYPARALLELPROCESSCONFIG
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        layout = self.layout()
+
+        self.segmentLength = QtWidgets.QLineEdit()
+        self.segmentLength.textChanged.connect(self.OptionsChanged)
+        self.segmentLength.setValidator(QtGui.QDoubleValidator())
+        self.segmentLength.setText(self.config["segment length"])
+        layout.addRow("Segment length / s:", self.segmentLength)
+
+        self.segmentOverlap = QtWidgets.QLineEdit()
+        self.segmentOverlap.textChanged.connect(self.OptionsChanged)
+        self.segmentOverlap.setValidator(QtGui.QDoubleValidator())
+        self.segmentOverlap.setText(self.config["segment overlap"])
+        layout.addRow("Segment overlap / s:", self.segmentOverlap)
+
+        self.maxWorkers = QtWidgets.QSpinBox()
+        # 0 means one worker per cpu core
+        self.maxWorkers.setMinimum(0)
+        self.maxWorkers.setSpecialValueText("All cores")
+        self.maxWorkers.setValue(self.config.getint("max workers"))
+        layout.addRow("Worker processes:", self.maxWorkers)
 
+    def getProcessOptions(self):
+        opts = super().getProcessOptions()
+        opts["segmentLength"] = float(self.segmentLength.text())
+        opts["segmentOverlap"] = float(self.segmentOverlap.text())
+        opts["maxWorkers"] = self.maxWorkers.value() or None
+
+        return opts
+
+    def anyOptionEmpty(self):
+        return (super().anyOptionEmpty() or not self.segmentLength.text()
+                or not self.segmentOverlap.text())
+
+
+class PanTompkinsProcessWidget(HeartPyProcessWidget):
+    # window size is the moving window integration width
+    config = _PANTOMPKINSPROCESSCONFIG
+
+
+class ProcessOptionsWidget(QtWidgets.QGroupBox):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -71,14 +114,13 @@ class ProcessOptionsWidget(QtWidgets.QGroupBox):
         self.setLayout(layout)
 
         self.availableProcessors = QtWidgets.QComboBox()
-        self.availableProcessors.addItems(
-            ProcessOptionsWidget.availableProcessors)
         layout.addWidget(self.availableProcessors)
 
         self.stackedProcessorLayout = QtWidgets.QStackedLayout()
-        for proc in ProcessOptionsWidget.availableProcessors.values():
-            proc = proc()
+        for entry in getRegistry().entries("processor"):
+            proc = entry.loadWidget()()
             proc.OptionsChanged.connect(self._monitorApplyButton)
+            self.availableProcessors.addItem(entry.name)
             self.stackedProcessorLayout.addWidget(proc)
         layout.addLayout(self.stackedProcessorLayout)
         self.availableProcessors.currentIndexChanged.connect(
@@ -68,10 +68,19 @@ class DataOptionWidget(QtWidgets.QGroupBox):
         self.availableDataTargets.setItemText(idx, newTarget)
 
     def addDataSource(self, source):
-        if self.containsDataSource(source):
-            raise ValueError(f"Can't add dublicate source: {source}")
+        self.addDataSources([source])
 
-        self.availableDataSources.addItem(source)
+    def addDataSources(self, sources):
+        sources = list(sources)
+
+        added = set()
+        for source in sources:
+            if self.containsDataSource(source) or source in added:
+                raise ValueError(f"Can't add dublicate source: {source}")
+
+            added.add(source)
+
+        self.availableDataSources.addItems(sources)
 
     def containsDataSource(self, source):
         return self.availableDataSources.findText(source) != -1
@@ -174,6 +183,28 @@ class DataWidget(QtWidgets.QWidget):
         self.dataOptionWidget.addDataSource(source)
         self.plotTableWidget.addRow(source)
 
+    def addDataSources(self, sources):
+        """Add many sources at once, e.g. when loading a session. The
+        widgets are filled without signals and relayouts in between,
+        CurrentDataSourceChanged is emitted once if the current source
+        changed."""
+        sources = list(sources)
+        available = self.availableDataSources()
+        current = available.currentText()
+
+        self.setUpdatesEnabled(False)
+        available.blockSignals(True)
+        try:
+            self.dataOptionWidget.addDataSources(sources)
+            self.plotTableWidget.addRows(sources)
+
+        finally:
+            available.blockSignals(False)
+            self.setUpdatesEnabled(True)
+
+        if available.currentText() != current:
+            self.CurrentDataSourceChanged.emit(available.currentText())
+
     def removeDataTarget(self, target):
         self.dataOptionWidget.removeDataTarget(target)
         self.plotTableWidget.removeColumn(target)
@@ -206,6 +237,9 @@ class DataWidget(QtWidgets.QWidget):
     def getCurrentFilterOptions(self):
         return self.filterWidget.currentOptions()
 
+    def getCurrentFilterPipeline(self):
+        return self.filterWidget.currentPipeline()
+
     def getCurrentDataManipulationOptions(self):
         return self.dataManipulationWidget.currentOptions()
 
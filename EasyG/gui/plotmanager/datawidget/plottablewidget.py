@@ -11,47 +11,37 @@ class PlotTableWidget(QtWidgets.QTableWidget):
         self.setMinimumWidth(350)
         self.itemClicked.connect(self.onItemClicked)
 
+        # {name: index} of the columns and rows
+        self._columnIndex = {}
+        self._rowIndex = {}
+
     def columnIndexOf(self, columnName):
-        for colIdx in range(self.columnCount()):
-            if self.horizontalHeaderItem(colIdx).text() == columnName:
-                break
+        try:
+            return self._columnIndex[columnName]
 
-        else:
+        except KeyError:
             raise ValueError(f"No such column: {columnName}")
 
-        return colIdx
-
     def rowIndexOf(self, rowName):
-        for rowIdx in range(self.rowCount()):
-            if self.verticalHeaderItem(rowIdx).text() == rowName:
-                break
+        try:
+            return self._rowIndex[rowName]
 
-        else:
+        except KeyError:
             raise ValueError(f"No such row: {rowName}")
 
-        return rowIdx
-
     def containsRow(self, rowName):
-        for rowIdx in range(self.rowCount()):
-            if self.verticalHeaderItem(rowIdx).text() == rowName:
-                result = True
-                break
-
-        else:
-            result = False
-
-        return result
+        return rowName in self._rowIndex
 
     def containsColumn(self, columnName):
-        for colIdx in range(self.columnCount()):
-            if self.horizontalHeaderItem(colIdx).text() == columnName:
-                result = True
-                break
+        return columnName in self._columnIndex
 
-        else:
-            result = False
+    @staticmethod
+    def _removeIndex(indices, name):
+        removed = indices.pop(name)
 
-        return result
+        for other, idx in indices.items():
+            if idx > removed:
+                indices[other] = idx - 1
 
     def addColumn(self, columnName):
         if self.containsColumn(columnName):
@@ -63,6 +53,7 @@ class PlotTableWidget(QtWidgets.QTableWidget):
 
         headerItem = QtWidgets.QTableWidgetItem(columnName)
         self.setHorizontalHeaderItem(lastColIdx, headerItem)
+        self._columnIndex[columnName] = lastColIdx
 
         for rowIdx in range(self.rowCount()):
             item = QtWidgets.QTableWidgetItem()
@@ -75,29 +66,43 @@ class PlotTableWidget(QtWidgets.QTableWidget):
         self.resizeColumnsToContents()
 
     def addRow(self, rowName):
-        if self.containsRow(rowName):
-            raise ValueError(f"Can't add dublicate row: {rowName}")
+        self.addRows([rowName])
 
-        # current rowCount will be last index of table with rowCount + 1
-        lastRowIdx = self.rowCount()
-        self.setRowCount(lastRowIdx + 1)
+    def addRows(self, rowNames):
+        """Add many rows with a single resize of the table"""
+        rowNames = list(rowNames)
 
-        headerItem = QtWidgets.QTableWidgetItem(rowName)
-        self.setVerticalHeaderItem(lastRowIdx, headerItem)
+        added = set()
+        for rowName in rowNames:
+            if self.containsRow(rowName) or rowName in added:
+                raise ValueError(f"Can't add dublicate row: {rowName}")
 
-        for colIdx in range(self.columnCount()):
-            item = QtWidgets.QTableWidgetItem()
-            item.setFlags(
-                QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsUserCheckable)
-            item.setCheckState(QtCore.Qt.Unchecked)
+            added.add(rowName)
+
+        # current rowCount will be the index of the first new row
+        firstRowIdx = self.rowCount()
+        self.setRowCount(firstRowIdx + len(rowNames))
+
+        for rowIdx, rowName in enumerate(rowNames, firstRowIdx):
+            headerItem = QtWidgets.QTableWidgetItem(rowName)
+            self.setVerticalHeaderItem(rowIdx, headerItem)
+            self._rowIndex[rowName] = rowIdx
+
+            for colIdx in range(self.columnCount()):
+                item = QtWidgets.QTableWidgetItem()
+                item.setFlags(
+                    QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsUserCheckable)
+                item.setCheckState(QtCore.Qt.Unchecked)
 
-            self.setItem(lastRowIdx, colIdx, item)
+                self.setItem(rowIdx, colIdx, item)
 
     def removeColumn(self, columnName):
         super().removeColumn(self.columnIndexOf(columnName))
+        self._removeIndex(self._columnIndex, columnName)
 
     def removeRow(self, rowName):
         super().removeRow(self.rowIndexOf(rowName))
+        self._removeIndex(self._rowIndex, rowName)
 
     def setCheckState(self, colIdx, rowIdx, state):
         self.item(rowIdx, colIdx).setCheckState(state)
@@ -131,13 +136,15 @@ class PlotTableWidget(QtWidgets.QTableWidget):
         self.PlotItemClicked.emit(colName, rowName, item.checkState())
 
     def updateRowName(self, previousName, newName):
-        for idx in range(self.rowCount()):
-            if (item := self.verticalHeaderItem(idx)).text() == previousName:
-                item.setText(newName)
+        if previousName in self._rowIndex:
+            idx = self._rowIndex.pop(previousName)
+            self._rowIndex[newName] = idx
+            self.verticalHeaderItem(idx).setText(newName)
 
     def updateColumnName(self, previousName, newName):
-        for idx in range(self.columnCount()):
-            if (item := self.horizontalHeaderItem(idx)).text() == previousName:
-                item.setText(newName)
+        if previousName in self._columnIndex:
+            idx = self._columnIndex.pop(previousName)
+            self._columnIndex[newName] = idx
+            self.horizontalHeaderItem(idx).setText(newName)
 
         self.resizeColumnsToContents()
@@ -1,3 +1,5 @@
+from functools import partial
+
 from PyQt5 import QtWidgets, QtCore
 
 import numpy as np
@@ -5,8 +7,17 @@ import numpy as np
 from .layoutwidget.splitter import ToplevelSplitter
 from .datawidget.datawidget import DataWidget
 from .plotwidget.plotwidget import ECGPlotWidget, ECGPlotDataItem
+from .plotwidget.rangelink import RangeLink
 from .serverstatus.status import ServerStatusWidget
-from EasyG.ecg import ecgprocessors, ecgfilters
+from EasyG.ecg.datastore import DataStore
+from EasyG.ecg.registry import getRegistry
+from EasyG.ecg.threadworker import ECGJobScheduler
+from EasyG.gui.nameregistry import NameRegistry
+from EasyG.ecg.resultcache import ResultCache, getResultCache
+
+
+# milliseconds a tab stays hidden before its empty plots are released
+RELEASEHIDDENAFTER = 5 * 60 * 1000
 
 
 class PlotManagerWidget(QtWidgets.QWidget):
@@ -22,8 +33,51 @@ class PlotManagerWidget(QtWidgets.QWidget):
         self.dataWidget = DataWidget()
         layout.addWidget(self.dataWidget, 0)
 
-        # dict of global ploItems {plotItemName: plotItem}
-        self._globalPlotItems = {}
+        # global ploItems {plotItemName: plotItem}
+        self._globalPlotItems = NameRegistry()
+        # the plot widgets by title
+        self._plotWidgets = NameRegistry(suffixFormat="{name} {i}")
+        # the data of the global plotItems, all their copies share it
+        self.dataStore = DataStore()
+        # shared time axis of all plot widgets, if linked
+        self._timeAxesLink = RangeLink(parent=self)
+        self._timeAxesLinked = False
+
+        # filtering and processing runs asynchronously, results are matched
+        # to their requests by jobID
+        # {jobID: (resultHandler, context, cacheKey)}. Jobs with the same
+        # (source, target, operation) key supersede each other, so only the
+        # latest Apply gets plotted
+        self._workerPool = ECGJobScheduler(parent=self)
+        self._workerPool.JobFinished.connect(self.onJobFinished)
+        self._workerPool.JobFailed.connect(self.onJobFailed)
+        self._workerPool.JobCancelled.connect(self.onJobCancelled)
+        self._pendingJobs = {}
+
+        # results are cached by source data version, bounds and options
+        self._resultCache = getResultCache()
+
+        # live data {sourceName: ECGStream} and the names of the plot items
+        # showing the output of streaming filters {itemName: sourceName}
+        self._streams = {}
+        self._streamFilters = {}
+        # streaming beat detectors {acceptedItemName: (sourceName,
+        # rejectedItemName or None once removed)}
+        self._streamDetectors = {}
+        # {itemName: number of samples of its ring buffer already stored}
+        self._streamAppended = {}
+
+        # while the tab is hidden, the streams keep collecting the data and
+        # the plots catch up once it is shown again
+        self._paused = False
+        self._staleStreams = set()
+        # the plots of a tab hidden for a while are released to save memory
+        self._releaseTimer = QtCore.QTimer(self)
+        self._releaseTimer.setSingleShot(True)
+        self._releaseTimer.setInterval(RELEASEHIDDENAFTER)
+        self._releaseTimer.timeout.connect(self.releaseHiddenPlotWidgets)
+
+        self.serverStatus = None
 
         # connect the spliterPlotWidget
         self.splitterWidget.ColumnInsertRequest.connect(
@@ -49,6 +103,155 @@ class PlotManagerWidget(QtWidgets.QWidget):
         self.serverStatus = ServerStatusWidget()
         self.layout().insertWidget(0, self.serverStatus)
 
+    def attachStream(self, sourceName, stream):
+        self._streams[sourceName] = stream
+        stream.BufferUpdated.connect(
+            partial(self.onStreamBufferUpdated, sourceName))
+
+    def isStreamSource(self, sourceName):
+        return sourceName in self._streams
+
+    def isStreamData(self, itemName):
+        """Whether a stream writes the data of itemName, its raw data or
+        the output of one of its filters or beat detectors"""
+        return (self.isStreamSource(itemName)
+                or itemName in self._streamFilters
+                or itemName in self._streamDetectors
+                or any(itemName == rejected
+                       for _, rejected in self._streamDetectors.values()))
+
+    def isPaused(self):
+        return self._paused
+
+    def setPaused(self, paused):
+        """Pause plotting, e.g. while the tab is hidden. Resuming shows the
+        data collected in the meantime with one update of every plot."""
+        if paused == self._paused:
+            return
+
+        self._paused = paused
+
+        if paused:
+            self._releaseTimer.start()
+
+        else:
+            self._releaseTimer.stop()
+
+            stale, self._staleStreams = self._staleStreams, set()
+
+            for sourceName in stale:
+                self.onStreamBufferUpdated(sourceName)
+
+        for plotWidget in self._plotWidgets.objects():
+            plotWidget.setPaused(paused)
+
+    def releaseHiddenPlotWidgets(self):
+        """Release the plots of hidden plot widgets without data to save
+        memory, done once the tab was paused for RELEASEHIDDENAFTER. They
+        are built again once shown, which is what makes it too costly for
+        every tab switch."""
+        for plotWidget in self._plotWidgets.objects():
+            # the time axes link holds on to the plot
+            if plotWidget not in self._timeAxesLink:
+                plotWidget.releasePlotItem()
+
+    def onStreamBufferUpdated(self, sourceName):
+        if self._paused:
+            self._staleStreams.add(sourceName)
+            return
+
+        stream = self._streams[sourceName]
+
+        self._appendStreamData(sourceName, stream.buffer())
+
+        for name in stream.filterNames():
+            self._appendStreamData(name, stream.buffer(name))
+
+        for name in stream.beatDetectorNames():
+            accepted, rejected = stream.peakBuffers(name)
+            self._appendStreamData(name, accepted)
+
+            rejectedName = self._streamDetectors[name][1]
+            if rejectedName is not None:
+                self._appendStreamData(rejectedName, rejected)
+
+            if self.serverStatus is not None:
+                self.serverStatus.setMeasures(stream.measures(name))
+
+    def _appendStreamData(self, itemName, buffer):
+        # only the samples written since the last update are new, the store
+        # keeps about as many as the ring buffer
+        x, y = buffer.since(self._streamAppended.get(itemName, 0))
+        self._streamAppended[itemName] = buffer.appended()
+
+        if not len(y):
+            return
+
+        try:
+            self.appendSourceData(itemName, x, y,
+                                  maxLength=buffer.capacity())
+
+        except ValueError:
+            # not in time order, e.g. the clock of the client was reset
+            self.setSourceData(itemName, *buffer.data())
+
+    def addStreamFilter(self, dataOptions, pipeline):
+        sourceName = dataOptions["data source"]
+
+        colIdx, rowIdx = self.indexOfPlotWidget(
+            self.plotWidgetFromTitle(dataOptions["data target"]))
+        name = self._filterItemName(dataOptions, pipeline)
+
+        plotItem = self.plot(rowIdx=rowIdx, columnIdx=colIdx,
+                             x=[], y=[],
+                             pen=dataOptions["target color"],
+                             name=name)
+
+        self._streams[sourceName].attachFilter(
+            plotItem.name(), pipeline.streamingFilter())
+        self._streamFilters[plotItem.name()] = sourceName
+
+        return plotItem
+
+    def addStreamBeatDetector(self, dataOptions, processor, processOptions):
+        sourceName = dataOptions["data source"]
+        detector = processor.loadStreaming()(**processOptions)
+
+        colIdx, rowIdx = self.indexOfPlotWidget(
+            self.plotWidgetFromTitle(dataOptions["data target"]))
+
+        accepted = self.plot(rowIdx=rowIdx, columnIdx=colIdx,
+                             x=[], y=[],
+                             pen=None, symbolBrush="g", symbol="x",
+                             symbolSize=11, name="accepted peaks")
+
+        rejected = self.plot(rowIdx=rowIdx, columnIdx=colIdx,
+                             x=[], y=[],
+                             pen=None, symbolBrush="r", symbol="o",
+                             symbolSize=11, name="rejected peaks")
+
+        self._streams[sourceName].attachBeatDetector(accepted.name(),
+                                                     detector)
+        self._streamDetectors[accepted.name()] = (sourceName, rejected.name())
+
+        return accepted, rejected
+
+    def _detachStreamOutput(self, itemName):
+        """Stop the streaming filter or beat detector writing itemName"""
+        sourceName = self._streamFilters.pop(itemName, None)
+
+        if sourceName is not None:
+            self._streams[sourceName].detachFilter(itemName)
+
+        if itemName in self._streamDetectors:
+            sourceName, _ = self._streamDetectors.pop(itemName)
+            self._streams[sourceName].detachBeatDetector(itemName)
+
+        for accepted, (sourceName, rejected) in self._streamDetectors.items():
+            if rejected == itemName:
+                # the detector goes on with the accepted peaks only
+                self._streamDetectors[accepted] = (sourceName, None)
+
     def registerGlobalPlotItem(self, item):
         if not item.isGlobalAncestor():
             raise ValueError("Can only store global ancesotrs!")
@@ -56,35 +259,44 @@ class PlotManagerWidget(QtWidgets.QWidget):
         name = item.name()
 
         if name in self._globalPlotItems:
-            if item is not self._globalPlotItems[item]:
+            if item is not self._globalPlotItems[name]:
                 raise KeyError(f"Item with name {name} already registerd!")
 
         else:
-            self._globalPlotItems[name] = item
+            self._globalPlotItems.add(name, item)
+
+        if name not in self.dataStore:
+            self.setSourceData(name, *item.getOriginalDataset())
 
     def getGlobalPlotItem(self, itemName):
         return self._globalPlotItems[itemName]
 
-    def _getUniquePlotItemTitle(self, defaultTitle="data"):
-        i = 0
-        title = defaultTitle
-        while self.dataWidget.containsDataSource(title):
-            i += 1
-            title = f"{defaultTitle} ({i})"
+    def setSourceData(self, itemName, x, y):
+        """Store new data for itemName and show it in all its plots"""
+        series = self.dataStore.set(itemName, x, y)
 
-        return title
+        item = self._globalPlotItems.get(itemName)
+        if item is not None:
+            item.setGlobalData(x=series.x, y=series.y)
+
+    def appendSourceData(self, itemName, x, y, maxLength=None):
+        """Append samples to the data of itemName in all its plots. The
+        plots only process the new samples. maxLength limits the stored
+        samples, see DataStore.append."""
+        series = self.dataStore.append(itemName, x, y, maxLength)
+
+        item = self._globalPlotItems.get(itemName)
+        if item is not None:
+            item.setGlobalData(x=series.x, y=series.y)
+
+    def _getUniquePlotItemTitle(self, defaultTitle="data"):
+        return self._globalPlotItems.uniqueName(defaultTitle)
 
     def _getUniquePlotTitle(self, defaultTitle=None):
         if defaultTitle is None:
             defaultTitle = "Plot"
 
-        i = 0
-        title = defaultTitle
-        while self.dataWidget.containsDataTarget(title):
-            i += 1
-            title = f"{defaultTitle} {i}"
-
-        return title
+        return self._plotWidgets.uniqueName(defaultTitle)
 
     def _getUserPlotTitle(self, defaultTitle):
         title, isValid = QtWidgets.QInputDialog.getText(
@@ -94,7 +306,7 @@ class PlotManagerWidget(QtWidgets.QWidget):
             text=defaultTitle)
 
         if isValid and title != defaultTitle:
-            while self.dataWidget.containsDataTarget(title):
+            while title in self._plotWidgets:
                 title, isValid = QtWidgets.QInputDialog.getText(
                     self,
                     "Plot title already exists!",
@@ -118,6 +330,7 @@ class PlotManagerWidget(QtWidgets.QWidget):
             title = self._getUserPlotTitle(title) or title
 
         plotWidget.setTitle(title)
+        self._plotWidgets.add(title, plotWidget)
 
         plotWidget.TitleChangeRequest.connect(
             self.onPlotWidgetTitleChangeRequest)
@@ -125,11 +338,19 @@ class PlotManagerWidget(QtWidgets.QWidget):
         plotWidget.NewROICoordinates.connect(
             self.onNewROICoodinates)
 
+        plotWidget.TimeAxesLinkRequest.connect(self.setTimeAxesLinked)
+        plotWidget.SweepModeChanged.connect(self.onPlotWidgetSweepModeChanged)
+        plotWidget.titleLabelLinkAction.setChecked(self._timeAxesLinked)
+
+        if self._timeAxesLinked:
+            self._timeAxesLink.addWidget(plotWidget)
+
     def insertColumn(self, columnIdx=None):
         self.splitterWidget.insertColumn(columnIdx)
 
     def insertPlotWidget(self, columnIdx=None, rowIdx=None, title=None):
         plotWidget = ECGPlotWidget()
+        plotWidget.setPaused(self._paused)
         self._initNewPlotWidget(plotWidget, defaultTitle=title)
 
         self.dataWidget.addDataTarget(plotWidget.getTitle())
@@ -138,12 +359,42 @@ class PlotManagerWidget(QtWidgets.QWidget):
 
         return plotWidget
 
-    def plotWidgetFromTitle(self, title):
-        for plotWidget in self.splitterWidget.iterWidgets():
-            if plotWidget.getTitle() == title:
-                break
+    def timeAxesLinked(self):
+        return self._timeAxesLinked
+
+    @QtCore.pyqtSlot(bool)
+    def setTimeAxesLinked(self, linked):
+        """Zoom and pan the time axes of all plot widgets together. Linking
+        needs the view boxes, so it builds the plots of all widgets, also of
+        the ones not shown yet."""
+        self._timeAxesLinked = linked
+
+        if not linked:
+            self._timeAxesLink.clear()
+
+        for plotWidget in self._plotWidgets.objects():
+            plotWidget.titleLabelLinkAction.setChecked(linked)
+
+            if linked:
+                self._timeAxesLink.addWidget(plotWidget)
+
+    @QtCore.pyqtSlot(object)
+    def onPlotWidgetSweepModeChanged(self, plotWidget):
+        # the sweep shows its own window, it rejoins the linked time axes
+        # once switched off
+        if not self._timeAxesLinked:
+            return
+
+        if plotWidget.sweepWindow() is None:
+            self._timeAxesLink.addWidget(plotWidget)
 
         else:
+            self._timeAxesLink.removeWidget(plotWidget)
+
+    def plotWidgetFromTitle(self, title):
+        plotWidget = self._plotWidgets.get(title)
+
+        if plotWidget is None:
             raise ValueError(f"No such plotwidget: {title}")
 
         return plotWidget
@@ -151,27 +402,45 @@ class PlotManagerWidget(QtWidgets.QWidget):
     def indexOfPlotWidget(self, plotWidget):
         return self.splitterWidget.indexOf(plotWidget)
 
-    def plot(self, columnIdx, rowIdx, **kwargs):
-        name = self._getUniquePlotItemTitle(kwargs.get("name", "data"))
-        kwargs["name"] = name
+    def plot(self, columnIdx, rowIdx, x, y, **kwargs):
+        return self.plotMany(columnIdx, rowIdx, [dict(kwargs, x=x, y=y)])[0]
 
-        plotWidget = self.splitterWidget.widget(columnIdx, rowIdx)
-        plotItem = ECGPlotDataItem(**kwargs)
+    def plotMany(self, columnIdx, rowIdx, series):
+        """Plot many series at once, e.g. when loading a session. series
+        are dicts of the arguments of plot, x, y and the options of the
+        item. The data widget and the legend are updated once for all of
+        them. Returns the plot items."""
+        plotItems = []
+
+        for kwargs in series:
+            kwargs = dict(kwargs)
+            x, y = kwargs.pop("x"), kwargs.pop("y")
+
+            name = self._getUniquePlotItemTitle(kwargs.get("name", "data"))
+            kwargs["name"] = name
 
-        colName, rowName = plotWidget.getTitle(), name
+            data = self.dataStore.set(name, x, y)
+            plotItem = ECGPlotDataItem(x=data.x, y=data.y, **kwargs)
+
+            self.registerGlobalPlotItem(plotItem)
+            plotItems.append(plotItem)
+
+        plotWidget = self.splitterWidget.widget(columnIdx, rowIdx)
+        colName = plotWidget.getTitle()
+        rowNames = [plotItem.name() for plotItem in plotItems]
 
         # do not use self.addPlotItem because it relys on the dataWidget
-        # already having the name present. Store the original for reference
-        # and add a copy to the widget
-        plotWidget.addItem(plotItem.copy())
-        self.registerGlobalPlotItem(plotItem)
+        # already having the name present. Store the originals for
+        # reference and add copies to the widget
+        plotWidget.addItems([plotItem.copy() for plotItem in plotItems])
 
-        self.dataWidget.addDataSource(name)
-        self.dataWidget.setPlotTableCheckStateByName(
-            colName, rowName,
-            state=QtCore.Qt.CheckState.Checked)
+        self.dataWidget.addDataSources(rowNames)
+        for rowName in rowNames:
+            self.dataWidget.setPlotTableCheckStateByName(
+                colName, rowName,
+                state=QtCore.Qt.CheckState.Checked)
 
-        return plotItem
+        return plotItems
 
     def addPlotItem(self, columnIdx, rowIdx, item):
         if item.isGlobalAncestor():
@@ -201,17 +470,41 @@ class PlotManagerWidget(QtWidgets.QWidget):
     def onWidgetRemoveRequest(self, columnIdx, rowIdx):
         widget = self.splitterWidget.widget(columnIdx, rowIdx)
         self.dataWidget.removeDataTarget(widget.getTitle())
+        # widget is the proxy of the splitter
+        plotWidget = self._plotWidgets.remove(widget.getTitle())
+        self._timeAxesLink.removeWidget(plotWidget)
 
         self.splitterWidget.removeWidget(columnIdx, rowIdx)
 
         for dataItem in widget.listDataItems():
-            if not dataItem.hasRelatives():
-                self.dataWidget.removeDataSource(dataItem.name())
+            name = dataItem.name()
 
             widget.removeItem(dataItem)
 
             dataItem.deleteLater()
 
+            # the global item always outlives its copies, the source is
+            # dropped once no other plot shows it
+            if not self.isPlotted(name):
+                self.removeSource(name)
+
+    def isPlotted(self, itemName):
+        return any(plotWidget.containsItemWithName(itemName)
+                   for plotWidget in self._plotWidgets.objects())
+
+    def removeSource(self, itemName):
+        """Remove the source itemName and stop the streaming filter or beat
+        detector feeding it. The raw data of a live stream is kept, the
+        stream goes on writing it."""
+        if self.isStreamSource(itemName):
+            return
+
+        self.dataWidget.removeDataSource(itemName)
+        self._detachStreamOutput(itemName)
+        self._globalPlotItems.remove(itemName)
+        self.dataStore.remove(itemName)
+        self._streamAppended.pop(itemName, None)
+
     @QtCore.pyqtSlot(object)
     def onPlotWidgetTitleChangeRequest(self, plotWidget):
         newTitle = self._getUserPlotTitle(plotWidget.getTitle())
@@ -219,6 +512,7 @@ class PlotManagerWidget(QtWidgets.QWidget):
         if newTitle is not None:
             self.dataWidget.updateDataTarget(plotWidget.getTitle(),
                                              newTitle)
+            self._plotWidgets.rename(plotWidget.getTitle(), newTitle)
             plotWidget.setTitle(newTitle)
 
     @QtCore.pyqtSlot(float, float)
@@ -232,11 +526,8 @@ class PlotManagerWidget(QtWidgets.QWidget):
     def onPlotTableItemClicked(self, plotName, itemName, checkState):
         plotItem = self.getGlobalPlotItem(itemName)
 
-        for plotWidget in self.splitterWidget.iterWidgets():
-            if plotWidget.getTitle() == plotName:
-                break
-
-        else:
+        plotWidget = self._plotWidgets.get(plotName)
+        if plotWidget is None:
             raise RuntimeError("Could not determine correct plot widget!")
 
         if checkState == QtCore.Qt.CheckState.Checked:
@@ -249,38 +540,120 @@ class PlotManagerWidget(QtWidgets.QWidget):
 
     @QtCore.pyqtSlot(str)
     def currentDataSourceChanged(self, itemName):
+        if not itemName:
+            # the last source was removed
+            return
+
         rate = self.getGlobalPlotItem(itemName).estimateSampleRate()
         self.dataWidget.setSamplingRate(rate)
 
     def _getDataFromOptions(self, dataOptions):
-        x, y = self.getGlobalPlotItem(dataOptions["data source"]).getData()
+        sourceName = dataOptions["data source"]
+        x, y = self.dataStore.series(sourceName).between(
+            *dataOptions["data bounds"])
 
-        lower, upper = dataOptions["data bounds"]
+        if self.isStreamData(sourceName):
+            # streams out of time order store views of their ring buffers,
+            # the next block overwrites them while a job reads them
+            # (_appendStreamData). Work on a snapshot
+            x, y = np.array(x), np.array(y)
 
-        if (lower and upper) is not None:
-            bounds = np.where(np.logical_and(lower <= x, x <= upper))
+        return x, y
 
-        elif lower is not None:
-            bounds = np.where(lower <= x)
+    def submitJob(self, resultHandler, fn, fnArgs=(), fnKwargs=None,
+                  context=(), priority=0, key=None, passCancelToken=False,
+                  cacheKey=None):
+        if cacheKey is not None:
+            result = self._resultCache.get(cacheKey)
 
-        elif upper is not None:
-            bounds = np.where(x <= upper)
+            if result is not None:
+                # an older job with the same key would overwrite this result
+                if key is not None:
+                    self._workerPool.cancelKey(key)
 
-        else:
-            bounds = slice(0, -1)
+                resultHandler(result, *context)
+                return None
+
+        job = self._workerPool.submit(fn, fnArgs, fnKwargs, priority=priority,
+                                      passCancelToken=passCancelToken,
+                                      key=key)
+        self._pendingJobs[job.jobID] = (resultHandler, context, cacheKey)
+
+        return job
+
+    def _cacheKey(self, dataOptions, operation, options):
+        version = self.dataStore.version(dataOptions["data source"])
 
-        return x[bounds], y[bounds]
+        return ResultCache.makeKey(version,
+                                   dataOptions["data bounds"],
+                                   operation, options)
+
+    @staticmethod
+    def _jobKey(dataOptions, operation):
+        return (dataOptions["data source"], dataOptions["data target"],
+                operation)
+
+    @QtCore.pyqtSlot(int, object)
+    def onJobFinished(self, jobID, result):
+        resultHandler, context, cacheKey = self._pendingJobs.pop(
+            jobID, (None, (), None))
+
+        if cacheKey is not None:
+            self._resultCache.put(cacheKey, result)
+
+        if resultHandler is not None:
+            resultHandler(result, *context)
+
+    @QtCore.pyqtSlot(int, Exception)
+    def onJobFailed(self, jobID, err):
+        self._pendingJobs.pop(jobID, None)
+
+        QtWidgets.QMessageBox.warning(self,
+                                      "Processing failed!",
+                                      f"Data processing failed: {err}",
+                                      QtWidgets.QMessageBox.Ok)
+
+    @QtCore.pyqtSlot(int)
+    def onJobCancelled(self, jobID):
+        self._pendingJobs.pop(jobID, None)
 
     @QtCore.pyqtSlot()
     def onDataWidgetProcessButtonPressed(self):
         dataOptions = self.dataWidget.getCurrentDataOptions()
         processOptions = self.dataWidget.getCurrentProcessOptions()
+        processorName = processOptions.pop("processor")
+        processor = getRegistry().get("processor", processorName)
+        processOptions = processor.checkOptions(processOptions)
+
+        if self.isStreamSource(dataOptions["data source"]):
+            if not processor.hasStreaming():
+                QtWidgets.QMessageBox.warning(
+                    self,
+                    "Processing failed!",
+                    f"{processorName} can not process live data",
+                    QtWidgets.QMessageBox.Ok)
+
+            else:
+                # live data is analysed block by block as it arrives
+                self.addStreamBeatDetector(dataOptions, processor,
+                                           processOptions)
+
+            return
 
         x, y = self._getDataFromOptions(dataOptions)
-        processor = getattr(ecgprocessors, processOptions.pop("processor"))
-        data, measures = processor(y, **processOptions)
 
-        rowIdx, colIdx = self.indexOfPlotWidget(
+        self.submitJob(self._onProcessResults,
+                       processor.load(), (y,), processOptions,
+                       context=(dataOptions, x, y),
+                       key=self._jobKey(dataOptions, "process"),
+                       passCancelToken=True,
+                       cacheKey=self._cacheKey(dataOptions, processorName,
+                                               processOptions))
+
+    def _onProcessResults(self, results, dataOptions, x, y):
+        data, measures = results
+
+        colIdx, rowIdx = self.indexOfPlotWidget(
             self.plotWidgetFromTitle(dataOptions["data target"]))
 
         self.plot(rowIdx=rowIdx, columnIdx=colIdx,
@@ -296,24 +669,82 @@ class PlotManagerWidget(QtWidgets.QWidget):
     @QtCore.pyqtSlot()
     def onDataWidgetFilterButtonPressed(self):
         dataOptions = self.dataWidget.getCurrentDataOptions()
-        filterOptions = self.dataWidget.getCurrentFilterOptions()
+        # presets have no sample rate, they filter at the rate of the source
+        rate = self.getGlobalPlotItem(
+            dataOptions["data source"]).estimateSampleRate()
+
+        if rate <= 0:
+            # e.g. a live source without two samples yet
+            QtWidgets.QMessageBox.warning(
+                self,
+                "Filtering failed!",
+                f"The sample rate of {dataOptions['data source']} is "
+                "unknown, it needs at least two samples",
+                QtWidgets.QMessageBox.Ok)
+            return
+
+        pipeline = self.dataWidget.getCurrentFilterPipeline().withSampleRate(
+            rate)
+
+        if self.isStreamSource(dataOptions["data source"]):
+            self.addStreamFilter(dataOptions, pipeline)
 
+        else:
+            self._filterStaticData(dataOptions, pipeline)
+
+    @staticmethod
+    def _filterItemName(dataOptions, pipeline):
+        return (dataOptions["target name"] or pipeline.name
+                or pipeline.description())
+
+    def _filterStaticData(self, dataOptions, pipeline):
         x, y = self._getDataFromOptions(dataOptions)
 
-        y = ecgfilters.HeartPyFilter(y, **filterOptions)
+        self.submitJob(self._onFilterResults,
+                       pipeline.apply, (y,),
+                       context=(dataOptions, pipeline, x),
+                       key=self._jobKey(dataOptions, "filter"),
+                       passCancelToken=True,
+                       cacheKey=self._cacheKey(dataOptions, "FilterPipeline",
+                                               pipeline.stages))
 
+    def _onFilterResults(self, y, dataOptions, pipeline, x):
         colIdx, rowIdx = self.indexOfPlotWidget(
             self.plotWidgetFromTitle(dataOptions["data target"]))
-        name = dataOptions["target name"] or filterOptions["filtertype"]
 
         self.plot(rowIdx=rowIdx, columnIdx=colIdx,
                   x=x, y=y,
                   pen=dataOptions["target color"],
-                  name=name)
+                  name=self._filterItemName(dataOptions, pipeline))
 
     @QtCore.pyqtSlot()
     def onDataManipulationButtonPressed(self):
         dataOptions = self.dataWidget.getCurrentDataOptions()
         manipulationOpts = self.dataWidget.getCurrentDataManipulationOptions()
 
-        self.DataManipulationButtonPressed.emit(dataOptions, manipulationOpts)
+        methodName = manipulationOpts.pop("manipulation method")
+        method = getRegistry().get("manipulation", methodName)
+        manipulationOpts = method.checkOptions(manipulationOpts)
+
+        x, y = self._getDataFromOptions(dataOptions)
+
+        self.submitJob(self._onManipulationResults,
+                       method.load(), (x, y), manipulationOpts,
+                       context=(dataOptions, methodName),
+                       key=self._jobKey(dataOptions, "manipulation"),
+                       passCancelToken=True,
+                       cacheKey=self._cacheKey(dataOptions, methodName,
+                                               manipulationOpts))
+
+    def _onManipulationResults(self, results, dataOptions, methodName):
+        x, y = results
+
+        colIdx, rowIdx = self.indexOfPlotWidget(
+            self.plotWidgetFromTitle(dataOptions["data target"]))
+
+        name = dataOptions["target name"] or dataOptions["data source"]
+
+        self.plot(rowIdx=rowIdx, columnIdx=colIdx,
+                  x=x, y=y,
+                  pen=dataOptions["target color"],
+                  name=f"{name} ({methodName.lower()})")
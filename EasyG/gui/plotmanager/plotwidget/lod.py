@@ -0,0 +1,296 @@
+"""Min/max level of detail pyramid for plotting long recordings.
+
+Level k splits the samples into bins of BASEBINSIZE * FACTOR**k samples and
+keeps the indices of the minimum and maximum of every bin. Drawing the
+extrema of the bins of the level matching the view width looks like the full
+signal at that resolution (R-peak spikes included), but costs only a few
+points per pixel. Bins are aligned to absolute sample numbers, so streams
+only recompute the bins touched by appended or dropped samples."""
+
+from functools import partial
+
+import numpy as np
+
+
+BASEBINSIZE = 16
+FACTOR = 4
+# coarsest level has at most this many bins
+MINBINS = 256
+# number of bins computed at once while building the base level
+_CHUNKBINS = 2 ** 16
+
+
+class _Level(object):
+    # min/max indices of bins, indices are absolute sample numbers
+    def __init__(self, binSize):
+        self.binSize = binSize
+        self.mins = np.empty(0, dtype=np.int64)
+        self.maxs = np.empty(0, dtype=np.int64)
+
+        # absolute bin number of mins[0], the first and the past the last
+        # valid bin
+        self._origin = 0
+        self.firstBin = 0
+        self.stopBin = 0
+
+    def __len__(self):
+        return self.stopBin - self.firstBin
+
+    def bins(self, start, stop):
+        start = max(start, self.firstBin) - self._origin
+        stop = min(stop, self.stopBin) - self._origin
+
+        return self.mins[start:stop], self.maxs[start:stop]
+
+    def write(self, start, mins, maxs):
+        """Set the bins from start on"""
+        stop = start + len(mins)
+
+        if start < self.firstBin or start > self.stopBin:
+            # nothing valid left
+            self._origin = self.firstBin = self.stopBin = start
+
+        if stop - self._origin > len(self.mins):
+            # move the valid bins to the front of a new buffer with room to
+            # grow
+            keep = start - self.firstBin
+            capacity = max(2 * (stop - self.firstBin), 1024)
+
+            newMins = np.empty(capacity, dtype=np.int64)
+            newMaxs = np.empty(capacity, dtype=np.int64)
+
+            old = self.firstBin - self._origin
+            newMins[:keep] = self.mins[old:old + keep]
+            newMaxs[:keep] = self.maxs[old:old + keep]
+
+            self.mins, self.maxs = newMins, newMaxs
+            self._origin = self.firstBin
+
+        self.mins[start - self._origin:stop - self._origin] = mins
+        self.maxs[start - self._origin:stop - self._origin] = maxs
+        self.stopBin = max(self.stopBin, stop)
+
+    def dropBefore(self, firstBin):
+        self.firstBin = min(max(firstBin, self.firstBin), self.stopBin)
+
+
+def _padEdges(values, before, after):
+    # like np.pad(mode="edge"), which is slow for the few bins of an update
+    if not (before or after):
+        return values
+
+    return np.concatenate((np.repeat(values[:1], before), values,
+                           np.repeat(values[-1:], after)))
+
+
+def _alignedExtrema(values, indices, groupSize):
+    # indices of min and max of consecutive groups of values. The edges are
+    # padded with copies of the edge values, so partial groups work too
+    shape = (-1, groupSize)
+    rows = np.arange(len(values) // groupSize)
+
+    values = values.reshape(shape)
+    indices = indices.reshape(shape)
+
+    return (indices[rows, values.argmin(axis=1)],
+            indices[rows, values.argmax(axis=1)])
+
+
+class MinMaxPyramid(object):
+    def __init__(self, baseBinSize=BASEBINSIZE, factor=FACTOR,
+                 minBins=MINBINS):
+        self.baseBinSize = baseBinSize
+        self.factor = factor
+        self.minBins = minBins
+
+        self.x = None
+        self.y = None
+        self._levels = []
+
+        # absolute sample number of x[0]
+        self._offset = 0
+        # (first x, last x, last y, length) of the data the pyramid was
+        # built for
+        self._previous = None
+
+    def __len__(self):
+        return 0 if self.y is None else len(self.y)
+
+    def levels(self):
+        return len(self._levels)
+
+    def setData(self, x, y):
+        """Build the pyramid from scratch"""
+        self._levels = []
+        self._offset = 0
+        self._setArrays(x, y)
+
+        self._update(0, 0)
+
+    def update(self, x, y):
+        """Update for new data. Data sharing samples with the previous data,
+        i.e. samples were appended and/or dropped at the front like in a
+        stream, only recomputes the affected bins. Otherwise the pyramid is
+        rebuilt."""
+        shift = self._shift(x, y)
+
+        if shift is None:
+            self.setData(x, y)
+
+        else:
+            dropped, kept = shift
+            self._offset += dropped
+            self._setArrays(x, y)
+
+            self._update(self._offset, self._offset + kept)
+
+    def _setArrays(self, x, y):
+        self.x = np.asarray(x)
+        self.y = np.asarray(y)
+
+        self._previous = ((self.x[0], self.x[-1], self.y[-1], len(self.x))
+                          if len(self.x) else None)
+
+    def _shift(self, x, y):
+        # (number of dropped samples, number of kept samples), None if x
+        # does not continue the previous data with new samples. The previous
+        # arrays may have been overwritten already (ring buffers), hence the
+        # copied bounds
+        if self._previous is None or not len(x) or not self._levels:
+            return None
+
+        first, last, lastY, length = self._previous
+        kept = np.searchsorted(x, last, side="right")
+
+        if (not kept or kept > length or kept == len(x)
+                or x[kept - 1] != last or y[kept - 1] != lastY):
+            return None
+
+        dropped = length - kept
+        if dropped == 0 and x[0] != first:
+            return None
+
+        return dropped, kept
+
+    def _update(self, first, dirty):
+        # first: absolute number of the first sample, dirty: absolute
+        # number of the first sample which changed
+        stop = self._offset + len(self.y)
+
+        if not len(self.y):
+            self._levels = []
+            return
+
+        binSize = self.baseBinSize
+        level = 0
+        while True:
+            if level == len(self._levels):
+                self._levels.append(_Level(binSize))
+                dirty = first
+
+            current = self._levels[level]
+            firstBin = first // binSize
+            stopBin = -(-stop // binSize)
+
+            current.dropBefore(firstBin)
+
+            if level == 0:
+                compute = self._computeBase
+
+            else:
+                compute = partial(self._computeLevel, self._levels[level - 1])
+
+            self._refresh(compute, current, firstBin, dirty // binSize,
+                          stopBin)
+
+            if stopBin - firstBin <= self.minBins:
+                break
+
+            level += 1
+            binSize *= self.factor
+
+        del self._levels[level + 1:]
+
+    def _refresh(self, compute, level, firstBin, dirtyBin, stopBin):
+        dirtyBin = max(dirtyBin, firstBin)
+
+        if firstBin >= level.stopBin:
+            dirtyBin = firstBin
+
+        elif firstBin < dirtyBin:
+            # the first bin is partial after samples have been dropped
+            compute(level, firstBin, firstBin + 1)
+
+        if dirtyBin < stopBin:
+            compute(level, dirtyBin, stopBin)
+
+    def _computeBase(self, level, startBin, stopBin):
+        for chunk in range(startBin, stopBin, _CHUNKBINS):
+            self._computeBaseChunk(level, chunk,
+                                   min(chunk + _CHUNKBINS, stopBin))
+
+    def _computeBaseChunk(self, level, startBin, stopBin):
+        binSize = level.binSize
+        start = startBin * binSize
+        stop = stopBin * binSize
+
+        lo = max(start - self._offset, 0)
+        hi = min(stop - self._offset, len(self.y))
+
+        padding = (lo + self._offset - start, stop - self._offset - hi)
+        values = _padEdges(self.y[lo:hi], *padding)
+        indices = _padEdges(np.arange(lo, hi) + self._offset, *padding)
+
+        mins, maxs = _alignedExtrema(values, indices, binSize)
+        level.write(startBin, mins, maxs)
+
+    def _computeLevel(self, finer, level, startBin, stopBin):
+        start = startBin * self.factor
+        stop = stopBin * self.factor
+
+        mins, maxs = finer.bins(start, stop)
+        lo = max(start, finer.firstBin)
+        padding = (lo - start, stop - lo - len(mins))
+
+        mins = _padEdges(mins, *padding)
+        maxs = _padEdges(maxs, *padding)
+
+        mins = _alignedExtrema(self.y[mins - self._offset], mins,
+                               self.factor)[0]
+        maxs = _alignedExtrema(self.y[maxs - self._offset], maxs,
+                               self.factor)[1]
+
+        level.write(startBin, mins, maxs)
+
+    def displayData(self, x0, x1, width):
+        """x, y to draw the range x0 to x1 at width pixels. Returns views of
+        the raw data if the range has only a few samples per pixel,
+        otherwise the extrema of the matching level"""
+        x, y = self.x, self.y
+        width = max(int(width), 1)
+
+        start = max(np.searchsorted(x, x0, side="right") - 1, 0)
+        stop = min(np.searchsorted(x, x1, side="left") + 1, len(x))
+
+        samples = stop - start
+        level = None
+        for candidate in self._levels:
+            if samples // candidate.binSize < width:
+                break
+
+            level = candidate
+
+        if level is None:
+            return x[start:stop], y[start:stop]
+
+        start += self._offset
+        stop += self._offset
+        mins, maxs = level.bins(start // level.binSize,
+                                -(-stop // level.binSize))
+
+        indices = np.empty(2 * len(mins), dtype=np.int64)
+        indices[0::2] = np.minimum(mins, maxs)
+        indices[1::2] = np.maximum(mins, maxs)
+        indices -= self._offset
+
+        return x[indices], y[indices]
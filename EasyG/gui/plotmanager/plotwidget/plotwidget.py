@@ -1,13 +1,28 @@
+from itertools import count
+
 from PyQt5 import QtCore, QtWidgets, QtGui
 from PyQt5.QtCore import Qt
 
+import numpy as np
 import pyqtgraph as pg
+from pyqtgraph.graphicsItems.PlotDataItem import PlotDataset
 
 from EasyG.config import setPyqtgraphConfig
+from EasyG.gui.nameregistry import NameRegistry
+
+from .lod import MinMaxPyramid
+from .sweep import DEFAULTSWEEPCAPACITY, SweepBuffer
 
 
 setPyqtgraphConfig()
 
+# data with at least this many samples is drawn from a min/max pyramid
+LODTHRESHOLD = 2 ** 16
+# same for markers only items like detected peaks, every marker is costly
+MARKERLODTHRESHOLD = 2 ** 10
+# seconds shown by the sweep mode unless chosen otherwise
+DEFAULTSWEEPSECONDS = 10
+
 _availableMarkers = [
     "None",
     "o",
@@ -31,19 +46,26 @@ _availableMarkers = [
 
 
 class GlobalPlotDataItem(pg.PlotDataItem):
+    # all related items share the ID of their family
+    _familyIDs = count()
+
     def __init__(self, *, ancestor=None, **kwargs):
+        # data set by setGlobalData, but not applied yet
+        self._pendingData = None
+
         super().__init__(clickable=True, **kwargs)
 
         self._kwargs = kwargs
+        self._familyID = next(GlobalPlotDataItem._familyIDs)
         self._ancestor = None
         self.kids = []
         self.setAncestor(ancestor)
 
-        self._plotClickedContextMenu = self._getPlotClickedContextMenu()
+        # built on the first click, sessions have many items which are
+        # never clicked
+        self._plotClickedContextMenu = None
         self.sigClicked.connect(self.onPlotClicked)
 
-        self.colorDialog = QtWidgets.QColorDialog()
-
     def ancestor(self):
         return self._ancestor
 
@@ -53,9 +75,20 @@ class GlobalPlotDataItem(pg.PlotDataItem):
 
         if ancestor is not None:
             ancestor.kids.append(self)
+            self._setFamilyID(ancestor.familyID())
 
         self._ancestor = ancestor
 
+    def familyID(self):
+        return self._familyID
+
+    def _setFamilyID(self, familyID):
+        items = [self]
+
+        for item in items:
+            item._familyID = familyID
+            items.extend(item.kids)
+
     def copy(self, **kwargs):
         kwargs = dict(self._kwargs, **kwargs)
 
@@ -70,10 +103,12 @@ class GlobalPlotDataItem(pg.PlotDataItem):
                 ancestor = self.kids[0]
                 ancestor.setAncestor(None)
 
-            for kid in self.kids:
+            for kid in list(self.kids):
                 kid.setAncestor(ancestor)
 
         self.setAncestor(None)
+        # not part of the family anymore
+        self._familyID = next(GlobalPlotDataItem._familyIDs)
         super().deleteLater()
 
     def globalAncestor(self):
@@ -89,59 +124,56 @@ class GlobalPlotDataItem(pg.PlotDataItem):
     def hasRelatives(self):
         return self.hasKids() or not self.isGlobalAncestor()
 
-    def isRelatedTo(self, item, *, _propagte=False):
-        result = False
+    def isRelatedTo(self, item):
+        return (isinstance(item, GlobalPlotDataItem)
+                and item.familyID() == self.familyID())
 
-        if self.isGlobalAncestor():
-            if item is self:
-                result = True
+    def family(self):
+        """The global ancestor and all of its descendants"""
+        family = [self.globalAncestor()]
 
-            else:
-                for kid in self.kids:
-                    result = kid.isRelatedTo(item, _propagte=True)
-                    if result:
-                        break
+        for item in family:
+            family.extend(item.kids)
 
-        else:
-            if _propagte:
-                if item is self:
-                    result = True
+        return family
 
-                else:
-                    for kid in self.kids:
-                        result = kid.isRelatedTo(item)
-                        if result:
-                            break
+    def setGlobalData(self, **kwargs):
+        """Set data for all related dataItems. All of them get the same
+        arrays. Items shown in an ECGPlotWidget are updated together with
+        the next repaint of their widget, all others once their data is
+        needed."""
+        self.globalAncestor()._propagateData(kwargs)
 
-            else:
-                result = self.ancestor().isRelatedTo(item)
+    def _propagateData(self, kwargs):
+        for item in self.family():
+            item._kwargs.update(kwargs)
+            item._pendingData = dict(item._pendingData or {}, **kwargs)
 
-        return result
+            widget = item.getViewWidget()
+            if widget is None:
+                # not shown, nothing to draw
+                continue
 
-    def setGlobalData(self, *, _propagte=False, **kwargs):
-        """Set data for all related dataItems, starting at the
-        global Ancestor and working our way down the tree"""
+            if hasattr(widget, "scheduleDataUpdate"):
+                widget.scheduleDataUpdate(item)
 
-        if self.isGlobalAncestor():
-            self._kwargs = kwargs
-            self.setData(**self._kwargs)
+            else:
+                item.applyPendingData()
 
-            for kid in self.kids:
-                kid.setGlobalData(_propagte=True, **kwargs)
+    def applyPendingData(self):
+        if self._pendingData is not None:
+            data, self._pendingData = self._pendingData, None
+            self.setData(**data)
 
-        else:
-            if _propagte:
-                # we are not the global Ancestor, but we are told to update
-                # ourself from the global Ancestor
-                self._kwargs = kwargs
-                self.setData(**self._kwargs)
+    def getData(self):
+        self.applyPendingData()
 
-                for kid in self.kids:
-                    kid.setGlobalData(_propagte=True, **kwargs)
+        return super().getData()
 
-            else:
-                # we are not the global Ancestor yet so keep looking
-                self.ancestor().setGlobalData(**kwargs)
+    def getOriginalDataset(self):
+        self.applyPendingData()
+
+        return super().getOriginalDataset()
 
     def _getPlotClickedContextMenu(self):
         menu = QtWidgets.QMenu()
@@ -152,16 +184,19 @@ class GlobalPlotDataItem(pg.PlotDataItem):
         return menu
 
     def onPlotClicked(self):
+        if self._plotClickedContextMenu is None:
+            self._plotClickedContextMenu = self._getPlotClickedContextMenu()
+
         action = self._plotClickedContextMenu.exec(QtGui.QCursor.pos())
 
         if action == self._plotClickedEditLineColor:
-            color = self.colorDialog.getColor()
+            color = QtWidgets.QColorDialog.getColor()
 
             if color.isValid():
                 self.setPen(color)
 
         elif action == self._plotClickedEditMarkerColor:
-            color = self.colorDialog.getColor()
+            color = QtWidgets.QColorDialog.getColor()
 
             if color.isValid():
                 self.setSymbolBrush()
@@ -181,10 +216,263 @@ class GlobalPlotDataItem(pg.PlotDataItem):
 
 
 class ECGPlotDataItem(GlobalPlotDataItem):
+    """Long recordings are drawn at the level of detail of the view, live
+    data optionally in a sweep like on ECG monitors. The timestamps have to
+    be sorted, like they are for every ECG."""
+
+    def __init__(self, **kwargs):
+        self._lod = None
+        # SweepBuffer in sweep mode and the connect option to restore
+        self._sweep = None
+        self._connect = None
+        super().__init__(**kwargs)
+
+    def _isMapped(self):
+        # True if the drawn data is not the data itself
+        opts = self.opts
+
+        return bool(opts["fftMode"] or opts["derivativeMode"]
+                    or opts["phasemapMode"] or opts["subtractMeanMode"]
+                    or any(opts["logMode"]))
+
+    def _isMarkers(self):
+        # only symbols, no line
+        return (self.opts["symbol"] is not None
+                and pg.mkPen(self.opts["pen"]).style() == Qt.NoPen)
+
+    def _useLevelOfDetail(self):
+        threshold = MARKERLODTHRESHOLD if self._isMarkers() else LODTHRESHOLD
+
+        return (self._dataset is not None
+                and len(self._dataset.y) >= threshold
+                and self.getViewBox() is not None
+                and self._sweep is None
+                and not self._isMapped())
+
+    def levelOfDetail(self):
+        """The min/max pyramid of the data, shared with all relatives
+        plotting the same data"""
+        owner = self.globalAncestor()
+        owner.applyPendingData()
+
+        if not _sameData(owner._dataset, self._dataset):
+            owner = self
+
+        if owner._lod is None:
+            owner._lod = MinMaxPyramid()
+
+        dataset = owner._dataset
+        if owner._lod.y is not dataset.y:
+            owner._lod.update(dataset.x, dataset.y)
+
+        return owner._lod
+
+    def setPen(self, *args, **kwargs):
+        # markers and lines have different levels of detail
+        self._datasetDisplay = None
+        super().setPen(*args, **kwargs)
+
+    def setSymbol(self, symbol):
+        self._datasetDisplay = None
+        super().setSymbol(symbol)
+
+    def sweepWindow(self):
+        return None if self._sweep is None else self._sweep.window
+
+    def setSweepWindow(self, window, eraseWidth=None):
+        """Draw the last window of the data at x modulo window, new samples
+        overwrite the previous sweep. None draws the data as it is."""
+        if window is None:
+            if self._sweep is not None:
+                self._sweep = None
+                self.opts["connect"] = self._connect
+
+        else:
+            if self._sweep is None:
+                self._connect = self.opts["connect"]
+
+            x = self.getOriginalDataset()[0]
+            count = (0 if x is None or not len(x)
+                     else len(x) - np.searchsorted(x, x[-1] - window))
+
+            self._sweep = SweepBuffer(
+                window, max(2 * count, DEFAULTSWEEPCAPACITY), eraseWidth)
+            self.opts["connect"] = self._sweep.connect
+
+        self._datasetDisplay = None
+        self.updateItems(styleUpdate=False)
+
+    def sweepPosition(self):
+        """x of the newest sample in sweep mode"""
+        if self._sweep is None:
+            return None
+
+        self._updateSweep()
+
+        return self._sweep.position()
+
+    def _updateSweep(self):
+        # hand the samples newer than the sweep to it
+        sweep = self._sweep
+        if self._dataset is None:
+            return
+
+        x, y = self._dataset.x, self._dataset.y
+        if not len(x) or (sweep.now is not None and x[-1] == sweep.now):
+            return
+
+        if sweep.now is not None and x[-1] < sweep.now:
+            # the data was replaced
+            sweep.clear()
+
+        start = np.searchsorted(x, x[-1] - sweep.window, side="right")
+        if sweep.now is not None:
+            start = max(start, np.searchsorted(x, sweep.now, side="right"))
+
+        sweep.append(x[start:], y[start:])
+        # growing the sweep replaces its arrays
+        self.opts["connect"] = sweep.connect
+        self._datasetDisplay = None
+
+    def updateItems(self, styleUpdate=True):
+        if self._sweep is not None:
+            self._updateSweep()
+
+        super().updateItems(styleUpdate)
+
+    def _getDisplayDataset(self):
+        if self._sweep is not None and self._dataset is not None:
+            if self._datasetDisplay is None:
+                self._datasetDisplay = PlotDataset(self._sweep.x,
+                                                   self._sweep.y)
+
+            return self._datasetDisplay
+
+        if not self._useLevelOfDetail():
+            return super()._getDisplayDataset()
+
+        if (self._datasetDisplay is None
+                or self.property("xViewRangeWasChanged")):
+            view = self.getViewBox()
+            viewRect = view.viewRect()
+
+            width = view.width()
+            if self._isMarkers():
+                # markers of the same bin would overlap anyway
+                width /= max(self.opts["symbolSize"], 1)
+
+            x, y = self.levelOfDetail().displayData(
+                viewRect.left(), viewRect.right(), width)
+
+            self._datasetDisplay = PlotDataset(x, y,
+                                               self._dataset.xAllFinite,
+                                               self._dataset.yAllFinite)
+            self.setProperty("xViewRangeWasChanged", False)
+
+        return self._datasetDisplay
+
+    def setData(self, *args, **kwargs):
+        """Arrays continuing the current ones in place, like the views of a
+        TimeSeriesBuffer after appending (PlotManagerWidget.appendSourceData),
+        only look at the new samples, so appending costs the same for short
+        and long data."""
+        x, y = kwargs.get("x"), kwargs.get("y")
+
+        if not args and kwargs.keys() == {"x", "y"} and self._extends(x, y):
+            self._extendData(x, y)
+            return
+
+        super().setData(*args, **kwargs)
+
+    def _extends(self, x, y):
+        # True if x and y continue the current arrays in place, i.e. samples
+        # were appended to the buffer holding them
+        dataset = self._dataset
+
+        return (dataset is not None
+                and isinstance(x, np.ndarray) and isinstance(y, np.ndarray)
+                and len(x) == len(y) > len(dataset.y)
+                and x.dtype == dataset.x.dtype and y.dtype == dataset.y.dtype
+                and _address(x) == _address(dataset.x)
+                and _address(y) == _address(dataset.y))
+
+    def _extendData(self, x, y):
+        old = self._dataset
+        dataset = PlotDataset(x.view(np.ndarray), y.view(np.ndarray))
+
+        if old._dataRect is not None and len(old.y):
+            # only the new samples have to be looked at
+            new = PlotDataset(dataset.x[len(old.y):], dataset.y[len(old.y):])
+            dataset._dataRect = _unitedRect(old._dataRect, new.dataRect())
+            dataset.xAllFinite = old.xAllFinite and new.xAllFinite
+            dataset.yAllFinite = old.yAllFinite and new.yAllFinite
+
+        self._dataset = dataset
+        self._datasetMapped = None
+        self._datasetDisplay = None
+        self._adsLastValue = 1
+
+        self.updateItems(styleUpdate=False)
+        self.informViewBoundsChanged()
+        self.sigPlotChanged.emit(self)
+
+    def getData(self):
+        self.applyPendingData()
+
+        # the level of detail and the sweep only affect drawing, the
+        # handlers need all of the data
+        if self._useLevelOfDetail() or (self._sweep is not None
+                                        and self._dataset is not None):
+            return self._dataset.x, self._dataset.y
+
+        return super().getData()
+
+    def viewRangeChanged(self, vb=None, ranges=None, changed=None):
+        super().viewRangeChanged(vb, ranges, changed)
+
+        if (changed is None or changed[0]) and self._useLevelOfDetail():
+            self._datasetDisplay = None
+            self.updateItems(styleUpdate=False)
+
+    def dataBounds(self, ax, frac=1.0, orthoRange=None):
+        if (frac < 1.0 or self._dataset is None or self._sweep is not None
+                or self._isMapped()):
+            return super().dataBounds(ax, frac, orthoRange)
+
+        if orthoRange is None:
+            # cached, appending only looks at the new samples
+            rect = self._dataset.dataRect()
+
+            if rect is None or not len(self._dataset.y):
+                return None, None
+
+            bounds = ((rect.left(), rect.right()) if ax == 0
+                      else (rect.top(), rect.bottom()))
+
+            return bounds if np.all(np.isfinite(bounds)) else (None, None)
+
+        if not self._useLevelOfDetail():
+            return super().dataBounds(ax, frac, orthoRange)
+
+        # the displayed data only covers the view, the bounds have to cover
+        # all of it
+        x, y = self._dataset.x, self._dataset.y
+
+        if ax == 0:
+            return x[0], x[-1]
+
+        y = self.levelOfDetail().displayData(
+            *orthoRange, self.getViewBox().width())[1]
+
+        if not len(y):
+            return None, None
+
+        return np.nanmin(y), np.nanmax(y)
+
     def estimateSampleRate(self):
         x = self.getData()[0]
 
-        if x:
+        if x is not None and len(x) > 1:
             rate = len(x) / (x[-1] - x[0]) * 1000
 
         else:
@@ -194,50 +482,195 @@ class ECGPlotDataItem(GlobalPlotDataItem):
         return rate
 
 
+def _forwardToPlotItem(name):
+    # GraphicsView has methods of the same names, they must not be used
+    # before the PlotItem is built
+    def method(self, *args, **kwargs):
+        return getattr(self.plotItem, name)(*args, **kwargs)
+
+    method.__name__ = name
+
+    return method
+
+
+def _noLegendUpdate():
+    pass
+
+
+def _address(array):
+    return array.__array_interface__["data"][0]
+
+
+def _sameData(dataset, other):
+    if dataset is None or other is None:
+        return False
+
+    # views of the same arrays
+    return all(_address(a) == _address(b) and len(a) == len(b)
+               for a, b in ((dataset.x, other.x), (dataset.y, other.y)))
+
+
+def _unitedRect(rect, other):
+    # QRectF.united ignores empty rects, like the bounds of a single sample
+    if other is None:
+        return rect
+
+    corners = np.array(
+        [[rect.left(), rect.top(), rect.right(), rect.bottom()],
+         [other.left(), other.top(), other.right(), other.bottom()]])
+    left, top = np.nanmin(corners[:, :2], axis=0)
+    right, bottom = np.nanmax(corners[:, 2:], axis=0)
+
+    return QtCore.QRectF(left, top, right - left, bottom - top)
+
+
 class ECGPlotWidget(pg.PlotWidget):
     # self
     TitleChangeRequest = QtCore.pyqtSignal(object)
     # x0, x1 coordinates of self._ROI
     NewROICoordinates = QtCore.pyqtSignal(float, float)
+    # link the time axes of all plots
+    TimeAxesLinkRequest = QtCore.pyqtSignal(bool)
+    # self, sweep mode switched on or off
+    SweepModeChanged = QtCore.pyqtSignal(object)
 
     def __init__(self, parent=None, background='default',
                  **kargs):
+        # the PlotItem (with legend, ROI and menus) is the expensive part of
+        # a plot, it is built once the widget gets visible or the plot is
+        # needed. Until then items and the title are only remembered
+        self._plotItemKwargs = kargs
+        self._plotItem = None
+
         pg.GraphicsView.__init__(self, parent, background=background)
         self.setSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding,
                            QtWidgets.QSizePolicy.Policy.Expanding)
 
         self.enableMouse(False)
 
-        self.plotItem = pg.PlotItem(**kargs)
-        self.setCentralItem(self.plotItem)
+        self._title = None
+        self._deferredItems = []
+        # {axis name: (text, units, unitPrefix, style)} of a released plot
+        self._axisLabels = {}
+
+        # region of interest, activated by double clicking
+        self._ROI = None
+        # connection of the setROISize slot upon double click
+        self._setROISizeConnection = None
 
-        for m in ['autoRange', 'clear', 'setAxisItems', 'setXRange',
-                  'setYRange', 'setRange', 'setAspectLocked',
-                  'setMouseEnabled', 'setXLink', 'setYLink', 'enableAutoRange',
-                  'disableAutoRange', 'setLimits', 'register', 'unregister',
-                  'viewRect']:
-            setattr(self, m, getattr(self.plotItem, m))
+        # the GlobalPlotDataItems of the widget {familyID: item}, only one
+        # item of a family is allowed
+        self._families = {}
+        # the named data items of the widget, the first one of a name wins
+        self._itemNames = NameRegistry()
 
-        self.plotItem.sigRangeChanged.connect(self.viewRangeChanged)
+        # x range of the sweep mode, None if the data is shown as it is
+        self._sweepWindow = None
+        self._eraseWidth = None
+
+        # items with new data, updated all at once before the next repaint
+        # or, while paused, once the widget is resumed
+        self._pendingDataItems = []
+        self._paused = False
+        self._dataUpdateTimer = QtCore.QTimer(self)
+        self._dataUpdateTimer.setSingleShot(True)
+        self._dataUpdateTimer.timeout.connect(self.applyPendingData)
+
+        self.titleLabelContextMenu = self._getTitleLabelContextMenu()
+
+    @property
+    def plotItem(self):
+        if self._plotItem is None:
+            self._buildPlotItem()
+
+        return self._plotItem
+
+    @plotItem.setter
+    def plotItem(self, plotItem):
+        # pyqtgraph sets None on close
+        self._plotItem = plotItem
+
+    def __getattr__(self, attr):
+        # only methods of the PlotItem are forwarded, probing for anything
+        # else must not build it
+        if not hasattr(pg.PlotItem, attr):
+            raise AttributeError(attr)
+
+        return super().__getattr__(attr)
+
+    def isPlotItemBuilt(self):
+        return self._plotItem is not None
+
+    def _buildPlotItem(self):
+        self._plotItem = pg.PlotItem(**self._plotItemKwargs)
+        self.setCentralItem(self._plotItem)
+
+        self._plotItem.sigRangeChanged.connect(self.viewRangeChanged)
 
         self.addLegend()
 
-        # region of interest, activated by double clicking
         self._ROI = pg.RectROI(pos=(0, 0), size=(0, 0),
                                pen=pg.mkPen("g", width=1.5, style=Qt.DashLine),
                                invertible=True)
         self._ROI.sigRegionChangeFinished.connect(self.emitROICoordinates)
         self._ROI.hide()
-        self.addItem(self._ROI)
-
-        # connection of the setROISize slot upon double click
-        self._setROISizeConnection = None
-
-        self.titleLabelContextMenu = self._getTitleLabelContextMenu()
+        self._plotItem.addItem(self._ROI)
 
         # inject a contextMenuEventHandler into the titleLabel so we can catch
         # right click events
-        self.plotItem.titleLabel.contextMenuEvent = self._showTitleContextMenu
+        self._plotItem.titleLabel.contextMenuEvent = self._showTitleContextMenu
+
+        if self._title is not None:
+            self._plotItem.setTitle(self._title)
+
+        for name, (text, units, unitPrefix, style) in self._axisLabels.items():
+            self._plotItem.getAxis(name).setLabel(text, units, unitPrefix,
+                                                  **style)
+        self._axisLabels = {}
+
+        items, self._deferredItems = self._deferredItems, []
+        self._addToPlotItem(items)
+
+        if self._sweepWindow is not None:
+            self._setSweepRange()
+
+    def releasePlotItem(self):
+        """Drop the PlotItem of a hidden widget without data items to save
+        memory, it is built again once needed. Returns True if released."""
+        if (self._plotItem is None or self.isVisible()
+                or self._plotItem.listDataItems()):
+            return False
+
+        for name in ("left", "bottom"):
+            axis = self._plotItem.getAxis(name)
+
+            if axis.labelText or axis.labelUnits:
+                self._axisLabels[name] = (axis.labelText, axis.labelUnits,
+                                          axis.labelUnitPrefix,
+                                          dict(axis.labelStyle))
+
+        self._plotItem.sigRangeChanged.disconnect(self.viewRangeChanged)
+        self._plotItem.close()
+        self.setCentralItem(QtWidgets.QGraphicsWidget())
+
+        self._plotItem = None
+        self._ROI = None
+
+        return True
+
+    def _buildIfVisible(self):
+        # a closed view has no scene anymore
+        if (self._plotItem is None and not self.closed and self.isVisible()
+                and not self.size().isEmpty()):
+            self._buildPlotItem()
+
+    def showEvent(self, event):
+        self._buildIfVisible()
+        super().showEvent(event)
+
+    def resizeEvent(self, event):
+        self._buildIfVisible()
+        super().resizeEvent(event)
 
     def _showTitleContextMenu(self, event):
         event.accept()
@@ -246,18 +679,78 @@ class ECGPlotWidget(pg.PlotWidget):
         if action == self.titleLabelEditTextAction:
             self.TitleChangeRequest.emit(self)
 
+        elif action == self.titleLabelLinkAction:
+            self.TimeAxesLinkRequest.emit(action.isChecked())
+
+        elif action == self.titleLabelSweepAction:
+            if self.sweepWindow() is not None:
+                self.setSweepMode(None)
+
+            else:
+                seconds, isValid = QtWidgets.QInputDialog.getDouble(
+                    self,
+                    "Sweep mode",
+                    "Seconds per sweep:",
+                    DEFAULTSWEEPSECONDS,
+                    0.1,
+                    3600,
+                    1)
+
+                if isValid:
+                    # assuming millisecond timestamps
+                    self.setSweepMode(seconds * 1000)
+
+                else:
+                    self.titleLabelSweepAction.setChecked(False)
+
     def getTitle(self):
-        return self.plotItem.titleLabel.text
+        return self._title
 
     def setTitle(self, title):
-        self.plotItem.setTitle(title)
+        self._title = title
+
+        if self._plotItem is not None:
+            self._plotItem.setTitle(title)
 
     def _getTitleLabelContextMenu(self):
         menu = QtWidgets.QMenu(self)
         self.titleLabelEditTextAction = menu.addAction("Edit Title")
+        self.titleLabelSweepAction = menu.addAction("Sweep mode")
+        self.titleLabelSweepAction.setCheckable(True)
+        self.titleLabelLinkAction = menu.addAction("Link time axes")
+        self.titleLabelLinkAction.setCheckable(True)
 
         return menu
 
+    def sweepWindow(self):
+        return self._sweepWindow
+
+    def setSweepMode(self, window, eraseWidth=None):
+        """Show the data like an ECG monitor: the x axis spans window and
+        new samples are drawn at their timestamp modulo window, overwriting
+        the previous sweep behind a moving gap. None shows the data as it
+        is again."""
+        self._sweepWindow = window
+        self._eraseWidth = eraseWidth
+        self.titleLabelSweepAction.setChecked(window is not None)
+
+        for item in self.listDataItems():
+            if isinstance(item, ECGPlotDataItem):
+                item.setSweepWindow(window, eraseWidth)
+
+        if self._plotItem is not None:
+            self._setSweepRange()
+
+        self.SweepModeChanged.emit(self)
+
+    def _setSweepRange(self):
+        if self._sweepWindow is None:
+            self.enableAutoRange(axis="x")
+
+        else:
+            self.disableAutoRange(axis="x")
+            self.setXRange(0, self._sweepWindow, padding=0)
+
     def mouseDoubleClickEvent(self, event):
         event.accept()
 
@@ -284,7 +777,8 @@ class ECGPlotWidget(pg.PlotWidget):
             super().mouseReleaseEvent(event)
 
     def mousePressEvent(self, event):
-        if event.button() == QtCore.Qt.RightButton and self._ROI.isVisible():
+        if (event.button() == QtCore.Qt.RightButton
+                and self._ROI is not None and self._ROI.isVisible()):
             event.accept()
             self._ROI.hide()
 
@@ -297,34 +791,145 @@ class ECGPlotWidget(pg.PlotWidget):
 
         self.NewROICoordinates.emit(x0, x1)
 
+    def isPaused(self):
+        return self._paused
+
+    def setPaused(self, paused):
+        """A paused widget collects the items with new data without
+        updating them, resuming updates all of them at once"""
+        self._paused = paused
+
+        if paused:
+            self._dataUpdateTimer.stop()
+
+        elif self._pendingDataItems:
+            self.applyPendingData()
+
+    def scheduleDataUpdate(self, item):
+        if item not in self._pendingDataItems:
+            self._pendingDataItems.append(item)
+
+        if not self._paused and not self._dataUpdateTimer.isActive():
+            self._dataUpdateTimer.start(0)
+
+    def applyPendingData(self):
+        items, self._pendingDataItems = self._pendingDataItems, []
+
+        # repaint once after all items are updated
+        self.setUpdatesEnabled(False)
+        try:
+            for item in items:
+                item.applyPendingData()
+
+        finally:
+            self.setUpdatesEnabled(True)
+
     def addItem(self, item):
-        if isinstance(item, GlobalPlotDataItem):
-            if any(item.isRelatedTo(it) for it in self.listDataItems()):
-                # we only allow non-related plotItems to be part!
-                raise ValueError("PlotItem already present!")
+        self.addItems([item])
+
+    def addItems(self, items):
+        """Add many items at once, the legend is relayouted only once"""
+        items = list(items)
+
+        families = set()
+        for item in items:
+            if isinstance(item, GlobalPlotDataItem):
+                if (item.familyID() in self._families
+                        or item.familyID() in families):
+                    # we only allow non-related plotItems to be part!
+                    raise ValueError("PlotItem already present!")
+
+                families.add(item.familyID())
+
+        for item in items:
+            if isinstance(item, GlobalPlotDataItem):
+                self._families[item.familyID()] = item
+
+            if isinstance(item, pg.PlotDataItem):
+                name = item.name()
+
+                if name is not None and name not in self._itemNames:
+                    self._itemNames.add(name, item)
 
-        self.plotItem.addItem(item)
+        if self._plotItem is None:
+            self._deferredItems.extend(items)
+
+        else:
+            self._addToPlotItem(items)
+
+        if self._sweepWindow is not None:
+            for item in items:
+                if isinstance(item, ECGPlotDataItem):
+                    item.setSweepWindow(self._sweepWindow, self._eraseWidth)
+
+    def _addToPlotItem(self, items):
+        # the legend resizes itself for every new entry, which costs more
+        # than adding the item. Resize it once after all are added
+        legend = self._plotItem.legend
+        if legend is not None:
+            legend.updateSize = _noLegendUpdate
+
+        try:
+            for item in items:
+                self._plotItem.addItem(item)
+
+        finally:
+            if legend is not None:
+                del legend.updateSize
+                legend.updateSize()
+
+    def familyItem(self, item):
+        """The item of the family of item in this widget or None"""
+        return self._families.get(item.familyID())
 
     def removeItem(self, item):
         if isinstance(item, GlobalPlotDataItem):
-            item = next((it for it in self.listDataItems()
-                         if item.isRelatedTo(it)), None)
+            item = self._families.pop(item.familyID(), None)
 
             if item is not None:
-                self.plotItem.removeItem(item)
+                self._removeItem(item)
+
+                if isinstance(item, ECGPlotDataItem):
+                    item.setSweepWindow(None)
+
+                if item in self._pendingDataItems:
+                    self._pendingDataItems.remove(item)
 
         else:
-            self.plotItem.removeItem(item)
+            self._removeItem(item)
 
-    def itemFromName(self, name):
-        for item in self.listDataItems():
-            if item.name() == name:
-                break
+        if (name := self._itemNames.nameOf(item)) is not None:
+            self._itemNames.remove(name)
+
+    def _removeItem(self, item):
+        if self._plotItem is None:
+            if item in self._deferredItems:
+                self._deferredItems.remove(item)
 
         else:
+            self._plotItem.removeItem(item)
+
+    def listDataItems(self):
+        if self._plotItem is None:
+            return [item for item in self._deferredItems
+                    if isinstance(item, pg.PlotDataItem)]
+
+        return self._plotItem.listDataItems()
+
+    def itemFromName(self, name):
+        item = self._itemNames.get(name)
+
+        if item is None:
             raise ValueError(f"No item with name: {name}")
 
         return item
 
     def containsItemWithName(self, name):
-        return any(item.name() == name for item in self.listDataItems())
+        return name in self._itemNames
+
+
+for m in ['autoRange', 'clear', 'setAxisItems', 'setXRange', 'setYRange',
+          'setRange', 'setAspectLocked', 'setMouseEnabled', 'setXLink',
+          'setYLink', 'enableAutoRange', 'disableAutoRange', 'setLimits',
+          'register', 'unregister', 'viewRect']:
+    setattr(ECGPlotWidget, m, _forwardToPlotItem(m))
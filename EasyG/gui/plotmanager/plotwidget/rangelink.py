@@ -0,0 +1,88 @@
+from functools import partial
+
+from PyQt5 import QtCore
+
+
+class RangeLink(QtCore.QObject):
+    """Shares the x range of plot widgets. Range changes are collected and
+    dispatched to all other widgets at once with the next turn of the event
+    loop, the latest change wins. The range changes caused by the dispatch
+    are not dispatched again, so there are no feedback loops like with
+    chained pyqtgraph links. Widgets in sweep mode show a window of their
+    own and are left out."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # {widget: connection}
+        self._widgets = {}
+
+        # (source widget, x range) of the latest change, the range all
+        # widgets show
+        self._pending = None
+        self._range = None
+
+        self._dispatchTimer = QtCore.QTimer(self)
+        self._dispatchTimer.setSingleShot(True)
+        self._dispatchTimer.timeout.connect(self.dispatch)
+
+    def __contains__(self, widget):
+        return widget in self._widgets
+
+    def widgets(self):
+        return list(self._widgets)
+
+    def addWidget(self, widget):
+        if widget in self._widgets or _inSweepMode(widget):
+            return
+
+        if self._range is not None:
+            widget.setXRange(*self._range, padding=0)
+
+        else:
+            self._range = tuple(widget.getViewBox().viewRange()[0])
+
+        self._widgets[widget] = widget.getViewBox().sigXRangeChanged.connect(
+            partial(self._onXRangeChanged, widget))
+
+    def removeWidget(self, widget):
+        connection = self._widgets.pop(widget, None)
+
+        if connection is not None:
+            widget.getViewBox().sigXRangeChanged.disconnect(connection)
+
+        if self._pending is not None and self._pending[0] is widget:
+            self._pending = None
+
+    def clear(self):
+        for widget in self.widgets():
+            self.removeWidget(widget)
+
+        self._range = None
+
+    def _onXRangeChanged(self, widget, viewBox, xRange):
+        xRange = tuple(xRange)
+
+        if xRange == self._range or _inSweepMode(widget):
+            # caused by the dispatch or the sweep
+            return
+
+        self._pending = (widget, xRange)
+
+        if not self._dispatchTimer.isActive():
+            self._dispatchTimer.start(0)
+
+    def dispatch(self):
+        if self._pending is None:
+            return
+
+        source, self._range = self._pending
+        self._pending = None
+
+        for widget in self._widgets:
+            if widget is not source and not _inSweepMode(widget):
+                widget.setXRange(*self._range, padding=0)
+
+
+def _inSweepMode(widget):
+    return widget.sweepWindow() is not None
@@ -0,0 +1,128 @@
+"""Sweep display of ECG monitors.
+
+A sample taken at time t is drawn at t modulo the window, so the trace is
+written from left to right and starts over at the left edge, overwriting the
+previous sweep. Ahead of the newest sample the oldest samples are erased,
+which leaves a moving gap between the new and the previous sweep. The
+samples live in slots of a fixed size buffer, appending only writes the
+slots of the new samples and erases the slots which left the window."""
+
+import numpy as np
+
+
+DEFAULTSWEEPCAPACITY = 2 ** 12
+# fraction of the window erased ahead of the newest sample
+ERASEFRACTION = 0.02
+
+
+class SweepBuffer(object):
+    def __init__(self, window, capacity=DEFAULTSWEEPCAPACITY,
+                 eraseWidth=None):
+        if window <= 0:
+            raise ValueError("The sweep window needs to be positive!")
+
+        self.window = window
+        self.eraseWidth = (window * ERASEFRACTION if eraseWidth is None
+                           else eraseWidth)
+
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        # timestamps, positions and values of the slots
+        self._t = np.full(capacity, -np.inf)
+        self.x = np.full(capacity, np.nan)
+        self.y = np.full(capacity, np.nan)
+        # connect[i]: draw a line from slot i to slot i + 1
+        self.connect = np.zeros(capacity, dtype=bool)
+
+        # next slot to write, number of erased slots from there on
+        self._head = 0
+        self._erased = 0
+        # timestamp of the newest sample
+        self.now = None
+
+    def __len__(self):
+        return len(self.y)
+
+    def clear(self):
+        self._allocate(len(self))
+
+    def position(self):
+        """x of the newest sample, None if there is none"""
+        return None if self.now is None else self.now % self.window
+
+    def append(self, t, y):
+        t = np.asarray(t, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+
+        if len(t) != len(y):
+            raise ValueError("t and y need to have the same length!")
+
+        if not len(t):
+            return
+
+        if self.now is not None and t[0] < self.now:
+            raise ValueError("Appended samples must not precede the "
+                             "buffered ones!")
+
+        # older samples would be overwritten by the same sweep anyway
+        start = np.searchsorted(t, t[-1] - self.window, side="right")
+        t, y = t[start:], y[start:]
+
+        self._reserve(t[-1], len(t))
+
+        capacity = len(self)
+        slots = (self._head + np.arange(len(t))) % capacity
+        x = t % self.window
+
+        self._t[slots] = t
+        self.x[slots] = x
+        self.y[slots] = y
+
+        # no lines back to the left edge and to the oldest samples
+        self.connect[slots[:-1]] = x[1:] >= x[:-1]
+        self.connect[slots[-1]] = False
+
+        previous = (self._head - 1) % capacity
+        self.connect[previous] = (self.now is not None
+                                  and self._t[previous] == self.now
+                                  and x[0] >= self.x[previous])
+
+        self._head = (self._head + len(t)) % capacity
+        self._erased = max(self._erased - len(t), 0)
+        self.now = t[-1]
+
+        self._erase(self.now - self.window + self.eraseWidth)
+
+    def _reserve(self, now, n):
+        # grow if the new samples would overwrite samples still shown
+        capacity = len(self)
+        slots = (self._head + np.arange(min(n, capacity))) % capacity
+
+        if n <= capacity and not np.any(self._t[slots] > now - self.window):
+            return
+
+        order = (self._head + np.arange(capacity)) % capacity
+        kept = order[np.isfinite(self._t[order])]
+        t, x, y = self._t[kept], self.x[kept], self.y[kept]
+        connect, now = self.connect[kept], self.now
+
+        self._allocate(max(2 * capacity, 2 * n))
+        size = len(kept)
+        self._t[:size], self.x[:size], self.y[:size] = t, x, y
+        self.connect[:size] = connect
+        self._head = size
+        self.now = now
+
+    def _erase(self, before):
+        # the slots from the head on hold the samples in chronological order
+        newer, older = self._t[:self._head], self._t[self._head:]
+        count = np.searchsorted(older, before, side="left")
+
+        if count == len(older):
+            count += np.searchsorted(newer, before, side="left")
+
+        slots = (self._head + np.arange(self._erased, count)) % len(self)
+        self.y[slots] = np.nan
+        self.connect[slots] = False
+        self._erased = max(count, self._erased)
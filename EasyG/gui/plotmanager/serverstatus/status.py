@@ -37,4 +37,17 @@ class ServerStatusWidget(QtWidgets.QWidget):
         addressLayout.addRow("Client Address:", self.addressLabel)
         layout.addLayout(addressLayout)
 
+        self.measuresLabel = QtWidgets.QLabel()
+        measuresLayout = QtWidgets.QFormLayout()
+        measuresLayout.addRow("Heart rate:", self.measuresLabel)
+        layout.addLayout(measuresLayout)
+
         layout.addStretch()
+
+    def setMeasures(self, measures):
+        if "bpm" in measures:
+            self.measuresLabel.setText(f"{measures['bpm']:.1f} bpm, "
+                                       f"IBI {measures['ibi']:.0f} ms")
+
+        else:
+            self.measuresLabel.clear()
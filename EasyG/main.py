@@ -8,9 +8,6 @@ from EasyG.network.client import EasyGTCPClient
 from EasyG.gui.mainwidget import MainWindow
 
 
-Config = getConfig()
-
-
 class EasyGServerPluginHandler(QObject):
     def __init__(self, serverPlugin=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -132,16 +129,19 @@ class EasyGGUI(EasyGServerPluginHandler):
         return oldServ
 
     def setDefaultServerPlugin(self):
-        serv = getattr(server, Config["server.config"]["type"])
+        config = getConfig()
+        serv = getattr(server, config["server.config"]["type"])
 
-        host = Config.getHostAddress("server", "address")
-        port = Config.getint("server", "port")
+        host = config.getHostAddress("server", "address")
+        port = config.getint("server", "port")
 
         serv = serv(hostAddress=host, hostPort=port)
 
         return self.setServerPlugin(serv)
 
     def _addServerPlotTabWidget(self, client):
+        from EasyG.ecg.ecgstream import ECGStream
+
         clientID = client.getClientID()
         tabName = f"EasyG Server Client: {clientID}"
 
@@ -152,3 +152,8 @@ class EasyGGUI(EasyGServerPluginHandler):
             plotterName=tabName)
 
         widget.addServerStatus()
+
+        stream = ECGStream(parent=widget)
+        client.newLineOfData.connect(stream.appendLine)
+        widget.attachStream(clientID, stream)
+        client.startParsing()
@@ -3,8 +3,6 @@ from enum import Enum, IntEnum
 from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot, QByteArray
 from PyQt5.QtSql import QSqlDatabase, QSqlQuery
 
-import bcrypt
-
 from EasyG.network.tcp import EasyGTCPSocket
 
 
@@ -12,11 +10,18 @@ DEFAULT_DB_DRIVER = "QSQLITE"
 _DEFAULT_DB_NAME = "EasyGClients.db"
 
 
+# bcrypt is imported on first use, only authentication needs it
+
+
 def getPasswordHash(password):
+    import bcrypt
+
     return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
 
 
 def checkPassword(password, passwordHash):
+    import bcrypt
+
     return bcrypt.checkpw(password.encode(), passwordHash.encode())
 
 
@@ -148,7 +153,8 @@ class AuthenticationErrorCodes(IntEnum):
 
 
 class EasyGAbstractAuthenticationProtocol(QObject):
-    CLIENTDB = EasyGClientDatabase()
+    # opened on first use, see clientDB
+    CLIENTDB = None
 
     authSuccess = pyqtSignal(str)
     authFailed = pyqtSignal(int)
@@ -157,6 +163,15 @@ class EasyGAbstractAuthenticationProtocol(QObject):
     def setClientDB(cls, db):
         cls.CLIENTDB = db
 
+    @classmethod
+    def clientDB(cls):
+        if cls.CLIENTDB is None:
+            # shared by all protocols, unless they set their own
+            EasyGAbstractAuthenticationProtocol.CLIENTDB = (
+                EasyGClientDatabase())
+
+        return cls.CLIENTDB
+
 
 class EasyGServerSideAuthentication(EasyGAbstractAuthenticationProtocol):
     @pyqtSlot(EasyGTCPSocket)
@@ -173,7 +188,7 @@ class EasyGServerSideAuthentication(EasyGAbstractAuthenticationProtocol):
             except ValueError:
                 clientPW = None
 
-            if clientPW is not None and self.CLIENTDB.checkClientPassword(
+            if clientPW is not None and self.clientDB().checkClientPassword(
                     clientID=clientID, clientPassword=clientPW):
                 socket.write(AuthenticationControlFlags.SUCCESS)
                 socket.write(AuthenticationControlFlags.EOM)
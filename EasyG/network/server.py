@@ -12,12 +12,18 @@ class EasyGAuthenticationServer(QObject):
     acceptError = pyqtSignal(EasyGTCPSocket.SocketError)
 
     def __init__(self, hostAddress, hostPort,
-                 server=EasyGTCPServer(),
+                 server=None,
                  clientType=EasyGTCPClient,
-                 authenticationProtocol=EasyGServerSideAuthentication(),
+                 authenticationProtocol=None,
                  *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+        if server is None:
+            server = EasyGTCPServer()
+
+        if authenticationProtocol is None:
+            authenticationProtocol = EasyGServerSideAuthentication()
+
         self.hostAddress = hostAddress
         self.hostPort = hostPort
 
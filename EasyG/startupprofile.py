@@ -0,0 +1,100 @@
+"""Import time profile and cold start measurement of EasyG. Run with
+
+    python -m EasyG.startupprofile [--top N] [--budget MS]
+
+Every measurement runs in a fresh interpreter. The cold start is the time
+from interpreter start until the main window has been shown and the event
+loop is idle, it fails if it exceeds the budget ([startup] budget ms in
+easyg.ini)."""
+
+import argparse
+import os
+import subprocess
+import sys
+
+from EasyG.config import getConfig
+
+
+DEFAULTBUDGET = 500
+DEFAULTTOP = 20
+
+_COLDSTART = """
+import time
+start = time.perf_counter()
+
+from PyQt5 import QtCore, QtWidgets
+app = QtWidgets.QApplication([])
+
+from EasyG.main import EasyGGUI
+gui = EasyGGUI()
+gui.show()
+
+QtCore.QTimer.singleShot(0, app.quit)
+app.exec_()
+
+print(1000 * (time.perf_counter() - start))
+"""
+
+
+def _run(args, env=None):
+    return subprocess.run([sys.executable, *args], capture_output=True,
+                          text=True, check=True, env=env)
+
+
+def importTimes(module="EasyG.main"):
+    """[(cumulative µs, self µs, module)] of importing module, slowest
+    first"""
+    stderr = _run(["-X", "importtime", "-c", f"import {module}"]).stderr
+
+    times = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+
+        selfTime, cumulative, name = line[len("import time:"):].split("|")
+
+        if selfTime.strip().isdigit():
+            times.append((int(cumulative), int(selfTime), name.strip()))
+
+    return sorted(times, reverse=True)
+
+
+def coldStartTime():
+    """Milliseconds until the main window is up, in a fresh interpreter"""
+    env = dict(os.environ)
+    # no display needed to measure
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    return float(_run(["-c", _COLDSTART], env=env).stdout.split()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m EasyG.startupprofile",
+        description="Profile the start up of EasyG")
+    parser.add_argument("--top", type=int, default=DEFAULTTOP,
+                        help="number of slowest imports to report")
+    parser.add_argument("--budget", type=float, default=None,
+                        help="cold start budget in ms")
+    args = parser.parse_args(argv)
+
+    budget = args.budget
+    if budget is None:
+        budget = getConfig().getfloat("startup", "budget ms",
+                                      fallback=DEFAULTBUDGET)
+
+    print(f"{'cumulative/ms':>14}{'self/ms':>10}  module")
+    for cumulative, selfTime, name in importTimes()[:args.top]:
+        print(f"{cumulative / 1000:>14.1f}{selfTime / 1000:>10.1f}  {name}")
+
+    elapsed = coldStartTime()
+    withinBudget = elapsed <= budget
+
+    print(f"\ncold start: {elapsed:.0f} ms, budget: {budget:.0f} ms "
+          f"({'ok' if withinBudget else 'exceeded'})")
+
+    return 0 if withinBudget else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())